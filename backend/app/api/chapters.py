@@ -7,6 +7,7 @@ from app.core.deps import get_db, get_current_user
 from app.models import User, Chapter, Upload, Question
 from app.schemas import ChapterSchema, QuestionResponseSchema
 from app.services.question_generator import QuestionGenerator
+from app.services.questions import generate_questions_job
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -246,4 +247,38 @@ async def generate_questions(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error generating questions"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/generate-questions/batch", status_code=status.HTTP_202_ACCEPTED)
+async def generate_questions_batch(
+    background_tasks: BackgroundTasks,
+    chapter_ids: List[int] = Query(...),
+    num_questions: int = Query(5, ge=1, le=20),
+    use_openai: bool = Query(True),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue question generation for several chapters and return immediately.
+
+    Questions are generated in the background; progress and failures are
+    appended to each upload's processing logs (GET /api/uploads/{upload_id}/status).
+    """
+    logger.info(f"Queueing question generation for chapters {chapter_ids}")
+    
+    # Verify every chapter belongs to the user
+    owned = {
+        chapter_id for chapter_id, in db.query(Chapter.id).join(Upload).filter(
+            Chapter.id.in_(chapter_ids),
+            Upload.user_id == current_user.id
+        )
+    }
+    missing = [chapter_id for chapter_id in chapter_ids if chapter_id not in owned]
+    if missing:
+        logger.warning(f"Chapters {missing} not found for user {current_user.id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chapter not found"
+        )
+    
+    background_tasks.add_task(generate_questions_job, chapter_ids, use_openai, num_questions)
+    return {"status": "queued", "chapter_ids": chapter_ids}
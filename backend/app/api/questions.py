@@ -6,7 +6,6 @@ import logging
 from app.core.deps import get_db, get_current_user
 from app.models import Question, QuestionAttempt
 from app.schemas import QuestionCreateSchema, QuestionResponseSchema, AnswerSubmitSchema, QuestionAttemptResponseSchema
-from app.services.quiz import generate_questions
 from app.services.question_generator import QuestionGenerator
 from app.services.chatgpt_question_generator import ChatGPTQuestionGenerator
 from app.models.user import User
@@ -224,6 +224,31 @@ def get_upload(
             detail="Error fetching upload"
         )
 
+@router.get("/{upload_id}/status")
+def get_upload_status(
+    upload_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the processing status and logs of an upload, including question generation jobs"""
+    upload = db.query(UploadModel).filter(
+        UploadModel.id == upload_id,
+        UploadModel.user_id == current_user.id
+    ).first()
+    if not upload:
+        logger.warning(f"Upload {upload_id} not found for user {current_user.id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    
+    logs = upload.processing_logs.split("\n") if upload.processing_logs else []
+    return {
+        "status": upload.status,
+        "message": logs[-1] if logs else "",
+        "logs": logs
+    }
+
 @router.post("/{upload_id}/process", response_model=UploadSchema)
 async def process_upload(
     upload_id: int,
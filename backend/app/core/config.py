@@ -26,6 +26,14 @@ class Settings(BaseSettings):
     # OpenAI settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "your-api-key-here")
     
+    # Sentence embeddings: "torch", or "onnx"/"openvino" for an exported graph
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch")
+    # Run the torch backend in FP16 on GPU / dynamic INT8 on CPU
+    EMBEDDING_QUANTIZE: bool = True
+    
+    # Upper bound on chapter sections analysed per chapter (0 = no limit)
+    ANALYSIS_MAX_SECTIONS: int = int(os.getenv("ANALYSIS_MAX_SECTIONS", "0"))
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
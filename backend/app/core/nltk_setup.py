@@ -7,9 +7,7 @@ def download_nltk_data():
     """Download all required NLTK data."""
     required_data = [
         'punkt',
-        'averaged_perceptron_tagger',
-        'maxent_ne_chunker',
-        'words'
+        'averaged_perceptron_tagger'
     ]
     
     for data in required_data:
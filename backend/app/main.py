@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import auth, uploads, chapters, questions, history, ws, exam_history
+from app.services.question_generator import QuestionGenerator
+from app.services.questions import aclose as close_question_service
 
 # Configure logging
 logging.basicConfig(
@@ -36,4 +38,12 @@ app.include_router(ws.router, prefix="/api/ws", tags=["websocket"])
 
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Application startup complete") 
\ No newline at end of file
+    # Load the embedding model in the background so requests don't pay for it
+    QuestionGenerator.warm_up()
+    logger.info("Application startup complete") 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await QuestionGenerator.aclose()
+    await close_question_service()
+    logger.info("Application shutdown complete")
@@ -1,7 +1,7 @@
 from .user import UserCreateSchema, UserSchema
 from .upload import UploadCreateSchema, UploadSchema
 from .chapter import ChapterCreateSchema, ChapterSchema
-from .question import QuestionCreateSchema, QuestionResponseSchema, AnswerSubmitSchema
+from .question import QuestionCreateSchema, QuestionResponseSchema, AnswerSubmitSchema, GeneratedQuestionSchema, GeneratedQuestionsSchema
 from .question_attempt import QuestionAttemptCreateSchema, QuestionAttemptResponseSchema
 from .auth import TokenSchema, TokenDataSchema
 
@@ -15,6 +15,8 @@ __all__ = [
     'QuestionCreateSchema',
     'QuestionResponseSchema',
     'AnswerSubmitSchema',
+    'GeneratedQuestionSchema',
+    'GeneratedQuestionsSchema',
     'QuestionAttemptCreateSchema',
     'QuestionAttemptResponseSchema',
     'TokenSchema',
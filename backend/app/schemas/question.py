@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class QuestionBaseSchema(BaseModel):
@@ -23,4 +23,21 @@ class QuestionResponseSchema(QuestionBaseSchema):
 
 class AnswerSubmitSchema(BaseModel):
     question_id: int
-    chosen_answer: str 
\ No newline at end of file
+    chosen_answer: str 
+
+class GeneratedQuestionSchema(BaseModel):
+    """A multiple choice question as the LLM is constrained to return it"""
+    question: str
+    options: List[str]
+    correct_answer: Literal["A", "B", "C", "D"]
+    explanation: str
+    difficulty: Literal["easy", "medium", "hard"]
+
+    class Config:
+        extra = "forbid"
+
+class GeneratedQuestionsSchema(BaseModel):
+    questions: List[GeneratedQuestionSchema]
+
+    class Config:
+        extra = "forbid"
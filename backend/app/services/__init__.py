@@ -1,9 +1,17 @@
 from .pdf import process_pdf, extract_chapters, extract_keywords
-from .quiz import generate_questions
 
 __all__ = [
     "process_pdf",
     "extract_chapters",
     "extract_keywords",
     "generate_questions"
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    # Imported on first access: the questions service pulls in the OpenAI
+    # client and the question generator, which most importers (and the
+    # analysis pool's worker processes) never need
+    if name == "generate_questions":
+        from .questions import generate_questions
+        return generate_questions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,11 @@
 import logging
 import asyncio
+from collections import Counter
 from typing import List, Dict
 import PyPDF2
 import re
 from sqlalchemy.orm import Session
 from app.models import Chapter, Upload
-from app.services.quiz import generate_questions
 from app.core.config import settings
 import os
 import traceback
@@ -13,6 +13,24 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Common chapter header patterns, anchored at the start of a line:
+# "Chapter 1", "CHAPTER 1", "1. Title", "I. Title", "Section 1"/"Part 1"
+_CHAPTER_HEADER_RE = re.compile(
+    r'^(?:Chapter\s+\d+|CHAPTER\s+\d+|\d+\.\s+[A-Z]|[IVX]+\.\s+[A-Z]|[A-Z][a-z]+\s+\d+)'
+)
+
+# Header prefixes stripped from a chapter title, applied in this order
+_TITLE_PREFIX_RES = tuple(re.compile(pattern) for pattern in (
+    r'^(Chapter|CHAPTER)\s+\d+\s*[-:]*\s*',
+    r'^\d+\.\s*',
+    r'^[IVX]+\.\s*',
+    r'^[A-Z][a-z]+\s+\d+\s*[-:]*\s*'
+))
+
+# Keyword extraction: punctuation to blank out, and a letter check per word
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_LETTER_RE = re.compile(r'[a-zA-Z]')
+
 def extract_summary(text: str, max_length: int = 500) -> str:
     """Extract a summary from the text by taking the first paragraph"""
     # Split into paragraphs and get the first non-empty one
@@ -36,28 +54,13 @@ def extract_summary(text: str, max_length: int = 500) -> str:
 
 def is_chapter_header(text: str) -> bool:
     """Check if the text is a chapter header"""
-    # Common chapter header patterns
-    patterns = [
-        r'^Chapter\s+\d+',  # Chapter 1, Chapter 2, etc.
-        r'^CHAPTER\s+\d+',  # CHAPTER 1, CHAPTER 2, etc.
-        r'^\d+\.\s+[A-Z]',  # 1. Title, 2. Title, etc.
-        r'^[IVX]+\.\s+[A-Z]',  # I. Title, II. Title, etc.
-        r'^[A-Z][a-z]+\s+\d+',  # Section 1, Part 1, etc.
-    ]
-    
-    # Check if text matches any pattern
-    for pattern in patterns:
-        if re.match(pattern, text.strip()):
-            return True
-    return False
+    return _CHAPTER_HEADER_RE.match(text.strip()) is not None
 
 def extract_chapter_title(text: str) -> str:
     """Extract chapter title from header text"""
     # Remove common prefixes
-    text = re.sub(r'^(Chapter|CHAPTER)\s+\d+\s*[-:]*\s*', '', text)
-    text = re.sub(r'^\d+\.\s*', '', text)
-    text = re.sub(r'^[IVX]+\.\s*', '', text)
-    text = re.sub(r'^[A-Z][a-z]+\s+\d+\s*[-:]*\s*', '', text)
+    for prefix_re in _TITLE_PREFIX_RES:
+        text = prefix_re.sub('', text)
     
     # Clean up the title
     title = text.strip()
@@ -268,11 +271,8 @@ def extract_chapters(file_path: str) -> List[dict]:
 def extract_keywords(text: str) -> List[str]:
     """Extract keywords from text - improved version"""
     try:
-        # Simple but more effective keyword extraction
-        import re
-        
         # Clean the text: remove extra whitespace and special characters
-        cleaned_text = re.sub(r'[^\w\s]', ' ', text.lower())
+        cleaned_text = _NON_WORD_RE.sub(' ', text.lower())
         words = cleaned_text.split()
         
         # More comprehensive stop words list
@@ -292,20 +292,16 @@ def extract_keywords(text: str) -> List[str]:
         }
         
         # Filter words: length > 3, not in stop words, and contains letters
-        keywords = []
-        word_freq = {}
-        
-        for word in words:
-            if (len(word) > 3 and 
-                word not in stop_words and 
-                re.search(r'[a-zA-Z]', word) and  # Contains at least one letter
-                not word.isdigit()):  # Not just numbers
-                
-                word_freq[word] = word_freq.get(word, 0) + 1
+        word_freq = Counter(
+            word for word in words
+            if (len(word) > 3 and
+                word not in stop_words and
+                _LETTER_RE.search(word) and  # Contains at least one letter
+                not word.isdigit())  # Not just numbers
+        )
         
-        # Sort by frequency and return top 15 unique keywords
-        sorted_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = [word for word, freq in sorted_keywords[:15]]
+        # Top 15 unique keywords by frequency (ties keep first-seen order)
+        keywords = [word for word, freq in word_freq.most_common(15)]
         
         return keywords
         
@@ -1,403 +1,968 @@
-from typing import List, Dict, Any, Tuple
-from typing import List, Dict, Any, Tuple
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, AsyncIterator, Tuple, Optional, Set
+import asyncio
+import hashlib
+import itertools
 import logging
+import multiprocessing
+import os
 import random
 import re
-from sentence_transformers import SentenceTransformer
-import torch
-import numpy as np
-from app.models import Chapter, Question
+import string
+import sys
+import threading
+from types import MappingProxyType
+from app.models import Chapter
 from app.schemas import QuestionCreateSchema
 import aiohttp
 import nltk
+import orjson
+from app.core.config import settings
 from app.core.nltk_setup import download_nltk_data
 
 logger = logging.getLogger(__name__)
 
+# Domain vocabularies used to pick concepts out of POS-tagged sentences.
+# Stored as frozensets so each token check is a hash lookup.
+_CS_TERMS = frozenset((
+    'algorithm', 'data structure', 'programming', 'software',
+    'database', 'network', 'security', 'web development',
+    'function', 'class', 'object', 'variable', 'method',
+    'interface', 'module', 'package', 'library', 'framework'
+))
+
+_LANGUAGE_TERMS = frozenset((
+    'vocabulary', 'grammar', 'reading', 'writing',
+    'pronunciation', 'speaking', 'listening', 'sentence',
+    'word', 'phrase', 'tense', 'verb', 'noun', 'adjective'
+))
+
+_MATH_TERMS = frozenset((
+    'algebra', 'calculus', 'geometry', 'statistics',
+    'equation', 'function', 'theorem', 'proof',
+    'number', 'formula', 'variable', 'constant',
+    'derivative', 'integral', 'matrix', 'vector'
+))
+
+_SCIENCE_TERMS = frozenset((
+    'physics', 'chemistry', 'biology', 'experiment',
+    'theory', 'hypothesis', 'research', 'analysis',
+    'molecule', 'atom', 'cell', 'organism',
+    'reaction', 'force', 'energy', 'matter'
+))
+
+_HISTORY_TERMS = frozenset((
+    'period', 'era', 'century', 'event',
+    'civilization', 'culture', 'war', 'revolution',
+    'dynasty', 'empire', 'kingdom', 'republic',
+    'treaty', 'battle', 'conquest', 'independence'
+))
+
+_BUSINESS_TERMS = frozenset((
+    'management', 'marketing', 'finance', 'economics',
+    'strategy', 'organization', 'leadership', 'entrepreneurship',
+    'market', 'product', 'service', 'customer',
+    'investment', 'profit', 'revenue', 'business'
+))
+
+_DOMAIN_TERMS = {
+    'computer_science': _CS_TERMS,
+    'language_learning': _LANGUAGE_TERMS,
+    'mathematics': _MATH_TERMS,
+    'science': _SCIENCE_TERMS,
+    'history': _HISTORY_TERMS,
+    'business': _BUSINESS_TERMS
+}
+
+# Reverse index from a lowercase term to every domain whose term list holds
+# it, so tokens are classified for all domains in a single pass
+_TERM_DOMAINS = MappingProxyType({
+    term: tuple(domain for domain, terms in _DOMAIN_TERMS.items() if term in terms)
+    for term in frozenset().union(*_DOMAIN_TERMS.values())
+})
+
+# Language learning domain patterns
+_LANGUAGE_DOMAIN_PATTERNS = MappingProxyType({
+    'vocabulary': {
+        'definition': (
+            "What is the meaning of the word '{word}'?",
+            "Which of the following best defines '{word}'?",
+            "What does '{word}' mean in this context?"
+        ),
+        'synonym': (
+            "Which word is a synonym of '{word}'?",
+            "Which of the following means the same as '{word}'?",
+            "What is another word for '{word}'?"
+        ),
+        'antonym': (
+            "Which word is an antonym of '{word}'?",
+            "Which of the following is the opposite of '{word}'?",
+            "What is the opposite meaning of '{word}'?"
+        ),
+        'usage': (
+            "In which sentence is '{word}' used correctly?",
+            "Which of the following uses '{word}' appropriately?",
+            "How should '{word}' be used in a sentence?"
+        )
+    },
+    'grammar': {
+        'structure': (
+            "Which sentence has the correct grammar structure?",
+            "Which of the following is grammatically correct?",
+            "What is the correct way to form this sentence?"
+        ),
+        'tenses': (
+            "Which tense is used in this sentence?",
+            "What is the correct tense for this situation?",
+            "How should this sentence be written in the past tense?"
+        ),
+        'parts_of_speech': (
+            "What part of speech is '{word}' in this sentence?",
+            "Which word in this sentence is a {part_of_speech}?",
+            "How is '{word}' functioning in this sentence?"
+        )
+    },
+    'reading_comprehension': {
+        'main_idea': (
+            "What is the main idea of this passage?",
+            "Which statement best summarizes the text?",
+            "What is the author's primary point?"
+        ),
+        'details': (
+            "According to the passage, what is true about {topic}?",
+            "Which detail from the text supports this idea?",
+            "What does the passage say about {topic}?"
+        ),
+        'inference': (
+            "What can be inferred from this passage?",
+            "Based on the text, what would the author likely agree with?",
+            "What conclusion can be drawn from this information?"
+        )
+    }
+})
+
+# Language learning quality indicators
+_LANGUAGE_QUALITY_INDICATORS = MappingProxyType({
+    'vocabulary_accuracy': (
+        'correct definition',
+        'appropriate usage',
+        'contextual meaning',
+        'word relationships',
+        'collocations'
+    ),
+    'grammar_correctness': (
+        'sentence structure',
+        'tense usage',
+        'agreement',
+        'punctuation',
+        'word order'
+    ),
+    'comprehension_depth': (
+        'main idea',
+        'supporting details',
+        'inferences',
+        'context clues',
+        'author\'s purpose'
+    )
+})
+
+# Common language learning topics and their relationships
+_LANGUAGE_TOPIC_RELATIONSHIPS = MappingProxyType({
+    'vocabulary': ('synonyms', 'antonyms', 'collocations', 'idioms'),
+    'grammar': ('tenses', 'parts of speech', 'sentence structure', 'agreement'),
+    'reading': ('comprehension', 'inference', 'context', 'main idea'),
+    'writing': ('organization', 'coherence', 'style', 'tone'),
+    'listening': ('comprehension', 'note-taking', 'inference', 'context'),
+    'speaking': ('pronunciation', 'fluency', 'intonation', 'pragmatics')
+})
+
+# External resource integration
+_EXTERNAL_RESOURCES = MappingProxyType({
+    'dictionary_api': 'https://api.dictionaryapi.dev/api/v2/entries/en/',
+    'thesaurus_api': 'https://api.datamuse.com/words',
+    'grammar_check_api': 'https://api.languagetool.org/v2/check',
+    'translation_api': 'https://translation.googleapis.com/language/translate/v2'
+})
+
+# Domain-specific knowledge patterns for computer science
+_CS_DOMAIN_PATTERNS = MappingProxyType({
+    'algorithms': {
+        'complexity': (
+            "What is the time complexity of {algorithm}?",
+            "Which of the following best describes the space complexity of {algorithm}?",
+            "How does the performance of {algorithm} scale with input size?"
+        ),
+        'implementation': (
+            "Which data structure would be most efficient for implementing {algorithm}?",
+            "What is the key step in the {algorithm} algorithm?",
+            "Which optimization would improve the performance of {algorithm}?"
+        ),
+        'comparison': (
+            "How does {algorithm1} compare to {algorithm2} in terms of efficiency?",
+            "When would you choose {algorithm1} over {algorithm2}?",
+            "What is the main advantage of {algorithm1} compared to {algorithm2}?"
+        )
+    },
+    'data_structures': {
+        'operations': (
+            "What is the time complexity of {operation} in {structure}?",
+            "Which operation in {structure} has O(1) time complexity?",
+            "How would you implement {operation} in {structure}?"
+        ),
+        'use_cases': (
+            "When would you choose {structure1} over {structure2}?",
+            "Which data structure is most suitable for {scenario}?",
+            "What are the advantages of using {structure} for {purpose}?"
+        ),
+        'implementation': (
+            "How would you implement {structure} using {language}?",
+            "What are the key components of {structure}?",
+            "Which design pattern would be most appropriate for {structure}?"
+        )
+    },
+    'programming_concepts': {
+        'principles': (
+            "Which principle of {concept} is demonstrated in this code?",
+            "How does {concept} improve code maintainability?",
+            "What is the main benefit of applying {concept}?"
+        ),
+        'best_practices': (
+            "Which of the following is a best practice for {concept}?",
+            "How would you refactor this code to better follow {concept}?",
+            "What is the recommended approach for implementing {concept}?"
+        ),
+        'common_pitfalls': (
+            "Which of these is a common mistake when using {concept}?",
+            "What could go wrong if {concept} is not properly implemented?",
+            "Which scenario would cause issues with {concept}?"
+        )
+    }
+})
+
+# Quality indicators for computer science questions
+_CS_QUALITY_INDICATORS = MappingProxyType({
+    'technical_accuracy': (
+        'time complexity',
+        'space complexity',
+        'algorithm efficiency',
+        'data structure operations',
+        'implementation details'
+    ),
+    'practical_relevance': (
+        'real-world application',
+        'use case',
+        'scenario',
+        'problem-solving',
+        'optimization'
+    ),
+    'conceptual_understanding': (
+        'principles',
+        'fundamentals',
+        'core concepts',
+        'underlying mechanisms',
+        'theoretical basis'
+    )
+})
+
+# Common computer science topics and their relationships
+_CS_TOPIC_RELATIONSHIPS = MappingProxyType({
+    'algorithms': ('data structures', 'complexity analysis', 'optimization'),
+    'data structures': ('algorithms', 'memory management', 'performance'),
+    'object-oriented': ('inheritance', 'polymorphism', 'encapsulation'),
+    'databases': ('normalization', 'indexing', 'transactions'),
+    'networking': ('protocols', 'routing', 'security'),
+    'operating systems': ('processes', 'memory', 'scheduling')
+})
+
+# Domain-specific question patterns
+_DOMAIN_PATTERNS = MappingProxyType({
+    'concept': {
+        'definition': (
+            "What is the definition of {concept}?",
+            "Which of the following best describes {concept}?",
+            "What does {concept} refer to in this context?"
+        ),
+        'application': (
+            "How would you apply {concept} in a real-world scenario?",
+            "Which situation best demonstrates the use of {concept}?",
+            "In what context would {concept} be most relevant?"
+        ),
+        'analysis': (
+            "What are the key components of {concept}?",
+            "How does {concept} relate to {related_concept}?",
+            "What are the implications of {concept}?"
+        )
+    },
+    'relationship': {
+        'causal': (
+            "What is the relationship between {concept1} and {concept2}?",
+            "How does {concept1} affect {concept2}?",
+            "What happens to {concept2} when {concept1} changes?",
+            "Which statement best describes how {concept1} influences {concept2}?"
+        ),
+        'comparative': (
+            "How does {concept1} differ from {concept2}?",
+            "What are the similarities between {concept1} and {concept2}?",
+            "Which statement best compares {concept1} and {concept2}?",
+            "What distinguishes {concept1} from {concept2}?"
+        ),
+        'hierarchical': (
+            "Which of the following is a subset of {concept1}?",
+            "What category does {concept1} belong to?",
+            "How is {concept1} classified in relation to {concept2}?",
+            "Which statement best describes the hierarchy between {concept1} and {concept2}?"
+        )
+    },
+    'application': {
+        'problem_solving': (
+            "How would you solve this problem using {concept}?",
+            "Which approach would be most effective for this scenario?",
+            "What steps would you take to apply {concept} here?",
+            "How would you use {concept} to address this situation?"
+        ),
+        'evaluation': (
+            "Which solution best demonstrates the principles of {concept}?",
+            "How would you evaluate the effectiveness of {concept} in this case?",
+            "What criteria would you use to assess the application of {concept}?",
+            "Which approach best exemplifies the use of {concept}?"
+        ),
+        'synthesis': (
+            "How would you combine {concept1} and {concept2} to solve this problem?",
+            "What new insights can be gained by applying {concept} in this context?",
+            "How would you integrate {concept} with existing knowledge?",
+            "Which approach best synthesizes {concept1} and {concept2}?"
+        )
+    }
+})
+
+# Domain-specific difficulty indicators
+_DIFFICULTY_INDICATORS = MappingProxyType({
+    'easy': {
+        'keywords': ('define', 'identify', 'list', 'describe', 'explain'),
+        'complexity': 'basic understanding'
+    },
+    'medium': {
+        'keywords': ('compare', 'contrast', 'analyze', 'apply', 'evaluate'),
+        'complexity': 'application and analysis'
+    },
+    'hard': {
+        'keywords': ('synthesize', 'create', 'design', 'critique', 'justify'),
+        'complexity': 'synthesis and evaluation'
+    }
+})
+
+# One keyword alternation per difficulty, checked in the order above so the
+# first difficulty with any keyword in the text still wins
+_DIFFICULTY_KEYWORD_RES = tuple(
+    (difficulty, re.compile('|'.join(map(re.escape, indicators['keywords'])), re.IGNORECASE))
+    for difficulty, indicators in _DIFFICULTY_INDICATORS.items()
+)
+
+# Default difficulty per pattern type when the question text has no indicators
+_PATTERN_DIFFICULTY = MappingProxyType({
+    'definition': 'easy',
+    'application': 'medium',
+    'analysis': 'hard'
+})
+
+# Difficulty per language question type
+_LANGUAGE_DIFFICULTY = MappingProxyType({
+    'definition': 'easy',
+    'synonym': 'medium',
+    'antonym': 'medium',
+    'usage': 'hard',
+    'structure': 'medium',
+    'tenses': 'hard',
+    'parts_of_speech': 'medium',
+    'main_idea': 'easy',
+    'details': 'medium',
+    'inference': 'hard'
+})
+
+# Domain detection patterns
+_DOMAIN_INDICATORS = MappingProxyType({
+    'computer_science': (
+        'algorithm', 'data structure', 'programming', 'software',
+        'database', 'network', 'security', 'web development'
+    ),
+    'language_learning': (
+        'vocabulary', 'grammar', 'reading', 'writing',
+        'pronunciation', 'speaking', 'listening'
+    ),
+    'mathematics': (
+        'algebra', 'calculus', 'geometry', 'statistics',
+        'equation', 'function', 'theorem', 'proof'
+    ),
+    'science': (
+        'physics', 'chemistry', 'biology', 'experiment',
+        'theory', 'hypothesis', 'research', 'analysis'
+    ),
+    'history': (
+        'period', 'era', 'century', 'event',
+        'civilization', 'culture', 'war', 'revolution'
+    ),
+    'business': (
+        'management', 'marketing', 'finance', 'economics',
+        'strategy', 'organization', 'leadership', 'entrepreneurship'
+    )
+})
+
+# Generic question patterns for any domain
+_GENERIC_DOMAIN_PATTERNS = MappingProxyType({
+    'concept': {
+        'definition': (
+            "What is the definition of {concept}?",
+            "Which of the following best describes {concept}?",
+            "What does {concept} refer to in this context?"
+        ),
+        'application': (
+            "How would you apply {concept} in a real-world scenario?",
+            "Which situation best demonstrates the use of {concept}?",
+            "In what context would {concept} be most relevant?"
+        ),
+        'analysis': (
+            "What are the key components of {concept}?",
+            "How does {concept} relate to {related_concept}?",
+            "What are the implications of {concept}?"
+        )
+    },
+    'process': {
+        'steps': (
+            "What is the correct sequence of steps for {process}?",
+            "Which step comes first in {process}?",
+            "What is the final step in {process}?"
+        ),
+        'purpose': (
+            "What is the main purpose of {process}?",
+            "Why is {process} important?",
+            "What problem does {process} solve?"
+        ),
+        'evaluation': (
+            "How would you evaluate the effectiveness of {process}?",
+            "What criteria would you use to assess {process}?",
+            "How can you measure the success of {process}?"
+        )
+    },
+    'analysis': {
+        'comparison': (
+            "How does {concept1} compare to {concept2}?",
+            "What are the similarities between {concept1} and {concept2}?",
+            "What are the key differences between {concept1} and {concept2}?"
+        ),
+        'evaluation': (
+            "What are the strengths and weaknesses of {concept}?",
+            "How effective is {concept} in achieving its goals?",
+            "What are the limitations of {concept}?"
+        ),
+        'synthesis': (
+            "How would you combine {concept1} and {concept2} to solve this problem?",
+            "What new insights can be gained by applying {concept} in this context?",
+            "How would you integrate {concept} with existing knowledge?"
+        )
+    }
+})
+
+# Pattern categories per question type, as tuples ready for random.choice
+_DOMAIN_PATTERN_CATEGORIES = MappingProxyType({
+    question_type: tuple(categories) for question_type, categories in _DOMAIN_PATTERNS.items()
+})
+_GENERIC_PATTERN_CATEGORIES = MappingProxyType({
+    question_type: tuple(categories) for question_type, categories in _GENERIC_DOMAIN_PATTERNS.items()
+})
+
+# Shallow-parse grammar used to chunk POS-tagged sentences into phrases
+_CHUNK_GRAMMAR = r"""
+    NP: {<DT>?<JJ>*<NN.*>+}
+    VP: {<VB.*><NP|PP|CLAUSE>+$}
+"""
+
+# Whitespace-separated words, scanned lazily to size paragraphs
+_WORD_RE = re.compile(r'\S+')
+
+# Phrases after which a sentence usually names a concept
+_CONCEPT_INDICATORS = (
+    'called', 'known as', 'referred to as', 'defined as',
+    'consists of', 'comprises', 'contains', 'includes',
+    'is a', 'are a', 'is an', 'are an',
+    'refers to', 'means', 'represents'
+)
+_CONCEPT_INDICATOR_ANY_RE = re.compile('|'.join(map(re.escape, _CONCEPT_INDICATORS)))
+
+# Technical terms picked up as key concepts wherever they appear in a sentence
+_KEY_TECHNICAL_TERMS = (
+    'function', 'method', 'class', 'object', 'variable',
+    'parameter', 'argument', 'return', 'type', 'interface',
+    'module', 'package', 'library', 'framework', 'algorithm',
+    'data structure', 'database', 'query', 'index', 'key',
+    'value', 'array', 'list', 'dictionary', 'map', 'set',
+    'tree', 'graph', 'node', 'edge', 'vertex', 'path'
+)
+# Surface form -> key term, covering plurals ("functions", "classes",
+# "queries") so whole-word matching still finds inflected mentions
+_KEY_TECHNICAL_TERM_FORMS = MappingProxyType({
+    form: term
+    for term in _KEY_TECHNICAL_TERMS
+    for form in (
+        term, term + 's', term + 'es',
+        *((term[:-1] + 'ies',) if term.endswith('y') and term[-2] not in 'aeiou' else ())
+    )
+})
+_KEY_TECHNICAL_TERM_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(_KEY_TECHNICAL_TERM_FORMS, key=len, reverse=True))) + r')\b'
+)
+
+# Relationship type -> phrases that express it between two concepts
+_RELATIONSHIP_INDICATORS = MappingProxyType({
+    'is_a': ('is a', 'are a', 'is an', 'are an'),
+    'has_a': ('has a', 'have a', 'contains', 'includes'),
+    'can': ('can', 'could', 'may', 'might'),
+    'requires': ('requires', 'needs', 'must have'),
+    'leads_to': ('leads to', 'results in', 'causes', 'creates')
+})
+
+# Any relationship indicator, so sentences without one are skipped in one scan
+_RELATIONSHIP_ANY_RE = re.compile('|'.join(
+    re.escape(indicator)
+    for indicators in _RELATIONSHIP_INDICATORS.values()
+    for indicator in indicators
+))
+
+# Section breaks: blank lines, or a newline before a numbered/labelled line
+_SECTION_SPLIT_RE = re.compile(r'\n\s*\n|\n(?=\d+\.|\w+\.)')
+
+# Sentence classifier used by section analysis; the matching group's name
+# tells whether a sentence reads as a definition, example or procedure
+_SENTENCE_KIND_RE = re.compile(
+    r'\b(?P<definition>is|are|refers to|means|defined as|consists of|comprises|contains)\b'
+    r'|\b(?P<example>for example|such as|like|including|e\.g\.|i\.e\.|specifically|notably)\b'
+    r'|\b(?P<procedure>first|then|next|finally|step|process|procedure|method|approach|technique)\b',
+    re.IGNORECASE
+)
+
+# Capitalized and CamelCase words, treated as candidate technical terms
+_CAPITALIZED_TERM_RE = re.compile(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b')
+
+# Common computer science technical term patterns, fused into one
+# alternation so a section is scanned once
+_TECHNICAL_TERM_RE = re.compile('|'.join((
+    r'\b(?:O\([^)]+\)|Big O|time complexity|space complexity)\b',
+    r'\b(?:algorithm|data structure|design pattern|framework|library)\b',
+    r'\b(?:inheritance|polymorphism|encapsulation|abstraction)\b',
+    r'\b(?:database|query|index|transaction|normalization)\b',
+    r'\b(?:protocol|routing|security|encryption|authentication)\b',
+    r'\b(?:process|thread|memory|scheduling|synchronization)\b'
+)), re.IGNORECASE)
+
+# Fenced code blocks and inline code spans
+_CODE_BLOCK_RE = re.compile(r'```(?:\w+)?\n(.*?)\n```', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+
+# Characters ignored when comparing analysed sentences for near-duplicates:
+# everything but letters, so page numbers and punctuation don't matter
+_SENTENCE_NOISE_RE = re.compile(r'[\W\d_]+')
+
+# Minimum number of words for a paragraph to become a reading passage
+_MIN_PASSAGE_WORDS = 50
+
+# Substrings that mark a passage sentence as a key point
+_KEY_POINT_RE = re.compile(
+    'important|key|main|primary|significant|notable|crucial|essential|fundamental',
+    re.IGNORECASE
+)
+_CONJUNCTION_STARTS = ('And', 'But', 'Or', 'So')
+
+# Two-letter POS tag prefixes kept as vocabulary: nouns, verbs, adjectives, adverbs
+_VOCAB_TAG_PREFIXES = frozenset(('NN', 'VB', 'JJ', 'RB'))
+
+# Option letters, in order (A, B, C, D, ...)
+_LETTERS = string.ascii_uppercase
+
+# Vocabulary question types generated for each word, in order
+_VOCAB_QUESTION_TYPES = ('definition', 'synonym', 'antonym', 'usage')
+
+# Question types drawn for concept-based questions
+_QUESTION_TYPES = ('concept', 'relationship', 'application')
+
+# LRU of generated questions keyed by (content hash, question count), so
+# chapters with identical content share an entry. Module-level so it is
+# shared by the per-request generator instances.
+_QUESTION_CACHE: "OrderedDict[Tuple[bytes, int], List[QuestionCreateSchema]]" = OrderedDict()
+_QUESTION_CACHE_SIZE = 128
+
+# Futures for generations currently running, keyed like _QUESTION_CACHE
+_IN_FLIGHT: Dict[Tuple[bytes, int], "asyncio.Future[List[QuestionCreateSchema]]"] = {}
+
+# Word lookups allowed to hit the external APIs at once, and the
+# per-request timeout in seconds
+_MAX_CONCURRENT_LOOKUPS = 16
+_LOOKUP_TIMEOUT = 3.0
+
+# Maximum number of words kept in the external dictionary/thesaurus cache
+_WORD_CACHE_SIZE = 10_000
+
+# Maximum number of chapters kept in the tokenization cache
+_NLP_CACHE_SIZE = 128
+
+# Maximum number of chapters kept in the content analysis cache
+_ANALYSIS_CACHE_SIZE = 128
+
+# Maximum number of sentence embeddings kept in memory
+_EMBEDDING_CACHE_SIZE = 20_000
+
+# Chapters at least this long are analysed in the worker process pool, off
+# the event loop; shorter ones are cheaper to analyse inline than to ship
+_ANALYSIS_POOL_MIN_CHARS = 20_000
+
+# Chapter analysis stops early once at least _ANALYSIS_MIN_SECTIONS sections
+# are analysed and the last _ANALYSIS_PLATEAU_WINDOW of them added fewer than
+# _ANALYSIS_PLATEAU_GROWTH new key concepts and technical terms in total
+_ANALYSIS_MIN_SECTIONS = 10
+_ANALYSIS_PLATEAU_WINDOW = 3
+_ANALYSIS_PLATEAU_GROWTH = 2
+
+# Set-valued fields of a content analysis, frozen before it is cached
+_ANALYSIS_SET_FIELDS = ('key_concepts', 'cs_topics', 'technical_terms')
+
+# Upper bound on torch intra-op threads for CPU embedding inference
+_MAX_TORCH_THREADS = 8
+
+# Maximum number of distinct texts kept in the sentence-split cache; small,
+# as entries can be whole chapters and analyses are memoized separately
+_SENT_CACHE_SIZE = 64
+
+def _detect_device() -> str:
+    """Best available torch device: CUDA, then Apple-silicon MPS, then CPU."""
+    import torch
+    
+    if torch.cuda.is_available():
+        return "cuda"
+    try:
+        if torch.backends.mps.is_available():
+            return "mps"
+    except AttributeError:
+        # torch builds older than 1.12 have no MPS backend
+        pass
+    return "cpu"
+
+# Process-wide embedding model, loaded on first use under the lock
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+def _get_embedding_model():
+    """Return the shared sentence embedding model, loading it on first use.
+
+    Concurrent first callers (a request and the startup warm-up thread, say)
+    wait on the lock for a single load instead of each loading the weights.
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                _embedding_model = _load_embedding_model()
+    return _embedding_model
+
+def _load_embedding_model():
+    """Load the sentence embedding model.
+
+    Imported and loaded lazily so that importing this module, and building a
+    QuestionGenerator per request, never pays for torch or the model weights.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    device = _detect_device()
+    backend = settings.EMBEDDING_BACKEND
+    logger.info(f"Loading SentenceTransformer model on {device} with {backend} backend")
+    
+    if device == "cpu":
+        # Intra-op threads for CPU inference; MiniLM stops scaling past ~8
+        torch.set_num_threads(min(_MAX_TORCH_THREADS, os.cpu_count() or 1))
+    
+    if backend == "torch":
+        model = SentenceTransformer('all-MiniLM-L6-v2', device=device)
+        if settings.EMBEDDING_QUANTIZE:
+            if device == "cuda":
+                # Run MiniLM in FP16 on GPU for faster encoding
+                model = model.half()
+            elif device == "cpu":
+                # INT8 weights for the Linear layers, activations quantized on the fly
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        # Exported ONNX/OpenVINO graph (needs sentence-transformers>=3.2 and optimum)
+        model = SentenceTransformer('all-MiniLM-L6-v2', device=device, backend=backend)
+    return model
+
+def _has_words(text: str, n: int) -> bool:
+    """Whether text has at least n words, without splitting all of it."""
+    return next(itertools.islice(_WORD_RE.finditer(text), n - 1, None), None) is not None
+
+def _content_digest(content: str) -> bytes:
+    """Short BLAKE2b digest of chapter content, used as a cache key."""
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+# Sentence splits per text digest (LRU); keyed by digest so the cache does
+# not also hold every chapter text as a key
+_sent_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+
+def _sent_tokenize(text: str) -> Tuple[str, ...]:
+    """Split text into sentences with Punkt, memoized per distinct text.
+
+    The same chapter, paragraph and passage strings are split by several
+    extraction and option helpers; the tuple result is safe to share.
+    """
+    key = _content_digest(text)
+    sentences = _sent_cache.get(key)
+    if sentences is not None:
+        _sent_cache.move_to_end(key)
+        return sentences
+    sentences = tuple(nltk.sent_tokenize(text))
+    _sent_cache[key] = sentences
+    if len(_sent_cache) > _SENT_CACHE_SIZE:
+        _sent_cache.popitem(last=False)
+    return sentences
+
+# Generator reused by analysis pool workers, built on a worker's first task
+_worker_generator = None
+
+def _analyze_in_worker(content: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Analyze content and detect its domains inside a pool worker process."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = QuestionGenerator()
+    return _worker_generator._analyze_content(content), _worker_generator._detect_domain(content)
+
 class QuestionGenerator:
+    # HTTP session for dictionary/thesaurus lookups, shared by all instances
+    # so connections, DNS lookups and TLS sessions are reused across requests
+    _http_session: Optional[aiohttp.ClientSession] = None
+
+    # Caps concurrent word lookups so a large batch can't flood the APIs
+    _api_semaphore: Optional[asyncio.Semaphore] = None
+
+    # Lookup results per lowercased word (LRU) and the lookups currently running
+    _word_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _word_lookups: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    # Tokenized and POS-tagged chapter content keyed by content hash (LRU)
+    _nlp_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+    # Content analysis and detected domains keyed by content hash (LRU)
+    _analysis_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], List[str]]]" = OrderedDict()
+
+    # POS tags of the joined important sentences keyed by text hash (LRU)
+    _important_tags_cache: "OrderedDict[bytes, Tuple[Tuple[str, str], ...]]" = OrderedDict()
+
+    # Normalized embedding per embedded text (LRU), so regenerating questions
+    # for a chapter only encodes sentences that have not been seen before
+    _embedding_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+    # Guards the embedding cache, as encoding runs in executor threads
+    _embedding_lock = threading.Lock()
+
+    # Set once the required NLTK data has been found or downloaded
+    _nltk_ready: bool = False
+
+    # Worker processes for analysing long chapters, created on first use
+    _analysis_pool: Optional[ProcessPoolExecutor] = None
+
     def __init__(self):
         logger.info("Initializing QuestionGenerator")
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Using device: {self.device}")
         
-        try:
-            # Download required NLTK data
-            download_nltk_data()
-            
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Successfully loaded SentenceTransformer model")
-        except Exception as e:
-            logger.error(f"Error loading models: {str(e)}")
-            raise
+        # Per-call RNG, reseeded from the chapter content in generate_questions
+        self._random = random.Random()
+        
+        # Regex chunker for grammar structures, compiled once per generator
+        self._chunker = nltk.RegexpParser(_CHUNK_GRAMMAR)
+        
+        if not QuestionGenerator._nltk_ready:
+            try:
+                # Download required NLTK data once per process
+                download_nltk_data()
+            except Exception as e:
+                logger.error(f"Error loading NLTK data: {str(e)}")
+                raise
+            QuestionGenerator._nltk_ready = True
 
-        # Language learning domain patterns
-        self.language_domain_patterns = {
-            'vocabulary': {
-                'definition': [
-                    "What is the meaning of the word '{word}'?",
-                    "Which of the following best defines '{word}'?",
-                    "What does '{word}' mean in this context?"
-                ],
-                'synonym': [
-                    "Which word is a synonym of '{word}'?",
-                    "Which of the following means the same as '{word}'?",
-                    "What is another word for '{word}'?"
-                ],
-                'antonym': [
-                    "Which word is an antonym of '{word}'?",
-                    "Which of the following is the opposite of '{word}'?",
-                    "What is the opposite meaning of '{word}'?"
-                ],
-                'usage': [
-                    "In which sentence is '{word}' used correctly?",
-                    "Which of the following uses '{word}' appropriately?",
-                    "How should '{word}' be used in a sentence?"
-                ]
-            },
-            'grammar': {
-                'structure': [
-                    "Which sentence has the correct grammar structure?",
-                    "Which of the following is grammatically correct?",
-                    "What is the correct way to form this sentence?"
-                ],
-                'tenses': [
-                    "Which tense is used in this sentence?",
-                    "What is the correct tense for this situation?",
-                    "How should this sentence be written in the past tense?"
-                ],
-                'parts_of_speech': [
-                    "What part of speech is '{word}' in this sentence?",
-                    "Which word in this sentence is a {part_of_speech}?",
-                    "How is '{word}' functioning in this sentence?"
-                ]
-            },
-            'reading_comprehension': {
-                'main_idea': [
-                    "What is the main idea of this passage?",
-                    "Which statement best summarizes the text?",
-                    "What is the author's primary point?"
-                ],
-                'details': [
-                    "According to the passage, what is true about {topic}?",
-                    "Which detail from the text supports this idea?",
-                    "What does the passage say about {topic}?"
-                ],
-                'inference': [
-                    "What can be inferred from this passage?",
-                    "Based on the text, what would the author likely agree with?",
-                    "What conclusion can be drawn from this information?"
-                ]
-            }
-        }
+        # Static question templates and indicators shared by all instances
+        self.language_domain_patterns = _LANGUAGE_DOMAIN_PATTERNS
+        self.language_quality_indicators = _LANGUAGE_QUALITY_INDICATORS
+        self.language_topic_relationships = _LANGUAGE_TOPIC_RELATIONSHIPS
+        self.external_resources = _EXTERNAL_RESOURCES
+        self.cs_domain_patterns = _CS_DOMAIN_PATTERNS
+        self.cs_quality_indicators = _CS_QUALITY_INDICATORS
+        self.cs_topic_relationships = _CS_TOPIC_RELATIONSHIPS
+        self.domain_patterns = _DOMAIN_PATTERNS
+        self.difficulty_indicators = _DIFFICULTY_INDICATORS
+        self.domain_indicators = _DOMAIN_INDICATORS
+        self.generic_domain_patterns = _GENERIC_DOMAIN_PATTERNS
 
-        # Language learning quality indicators
-        self.language_quality_indicators = {
-            'vocabulary_accuracy': [
-                'correct definition',
-                'appropriate usage',
-                'contextual meaning',
-                'word relationships',
-                'collocations'
-            ],
-            'grammar_correctness': [
-                'sentence structure',
-                'tense usage',
-                'agreement',
-                'punctuation',
-                'word order'
-            ],
-            'comprehension_depth': [
-                'main idea',
-                'supporting details',
-                'inferences',
-                'context clues',
-                'author\'s purpose'
-            ]
-        }
+    @classmethod
+    def warm_up(cls) -> None:
+        """Start loading the embedding model in a background thread.
 
-        # Common language learning topics and their relationships
-        self.language_topic_relationships = {
-            'vocabulary': ['synonyms', 'antonyms', 'collocations', 'idioms'],
-            'grammar': ['tenses', 'parts of speech', 'sentence structure', 'agreement'],
-            'reading': ['comprehension', 'inference', 'context', 'main idea'],
-            'writing': ['organization', 'coherence', 'style', 'tone'],
-            'listening': ['comprehension', 'note-taking', 'inference', 'context'],
-            'speaking': ['pronunciation', 'fluency', 'intonation', 'pragmatics']
-        }
+        Lets the first generation request skip the model's cold start; a
+        failed load is only logged, and is retried on first real use.
+        """
+        def load():
+            try:
+                _get_embedding_model()
+                logger.info("Embedding model warmed up")
+            except Exception as e:
+                logger.warning(f"Embedding model warm-up failed: {str(e)}")
+        
+        threading.Thread(target=load, name="embedding-warm-up", daemon=True).start()
 
-        # External resource integration
-        self.external_resources = {
-            'dictionary_api': 'https://api.dictionaryapi.dev/api/v2/entries/en/',
-            'thesaurus_api': 'https://api.datamuse.com/words',
-            'grammar_check_api': 'https://api.languagetool.org/v2/check',
-            'translation_api': 'https://translation.googleapis.com/language/translate/v2'
-        }
+    @property
+    def embedding_model(self):
+        """Sentence embedding model shared by all generator instances."""
+        return _get_embedding_model()
 
-        # Domain-specific knowledge patterns for computer science
-        self.cs_domain_patterns = {
-            'algorithms': {
-                'complexity': [
-                    "What is the time complexity of {algorithm}?",
-                    "Which of the following best describes the space complexity of {algorithm}?",
-                    "How does the performance of {algorithm} scale with input size?"
-                ],
-                'implementation': [
-                    "Which data structure would be most efficient for implementing {algorithm}?",
-                    "What is the key step in the {algorithm} algorithm?",
-                    "Which optimization would improve the performance of {algorithm}?"
-                ],
-                'comparison': [
-                    "How does {algorithm1} compare to {algorithm2} in terms of efficiency?",
-                    "When would you choose {algorithm1} over {algorithm2}?",
-                    "What is the main advantage of {algorithm1} compared to {algorithm2}?"
-                ]
-            },
-            'data_structures': {
-                'operations': [
-                    "What is the time complexity of {operation} in {structure}?",
-                    "Which operation in {structure} has O(1) time complexity?",
-                    "How would you implement {operation} in {structure}?"
-                ],
-                'use_cases': [
-                    "When would you choose {structure1} over {structure2}?",
-                    "Which data structure is most suitable for {scenario}?",
-                    "What are the advantages of using {structure} for {purpose}?"
-                ],
-                'implementation': [
-                    "How would you implement {structure} using {language}?",
-                    "What are the key components of {structure}?",
-                    "Which design pattern would be most appropriate for {structure}?"
-                ]
-            },
-            'programming_concepts': {
-                'principles': [
-                    "Which principle of {concept} is demonstrated in this code?",
-                    "How does {concept} improve code maintainability?",
-                    "What is the main benefit of applying {concept}?"
-                ],
-                'best_practices': [
-                    "Which of the following is a best practice for {concept}?",
-                    "How would you refactor this code to better follow {concept}?",
-                    "What is the recommended approach for implementing {concept}?"
-                ],
-                'common_pitfalls': [
-                    "Which of these is a common mistake when using {concept}?",
-                    "What could go wrong if {concept} is not properly implemented?",
-                    "Which scenario would cause issues with {concept}?"
-                ]
-            }
-        }
+    def _encode(self, texts: List[str]):
+        """Embed all texts in one batched call.
 
-        # Quality indicators for computer science questions
-        self.cs_quality_indicators = {
-            'technical_accuracy': [
-                'time complexity',
-                'space complexity',
-                'algorithm efficiency',
-                'data structure operations',
-                'implementation details'
-            ],
-            'practical_relevance': [
-                'real-world application',
-                'use case',
-                'scenario',
-                'problem-solving',
-                'optimization'
-            ],
-            'conceptual_understanding': [
-                'principles',
-                'fundamentals',
-                'core concepts',
-                'underlying mechanisms',
-                'theoretical basis'
-            ]
-        }
+        Callers collect every text first and read the rows back by index;
+        row i of the result is the normalized embedding of texts[i]. Blocks
+        on the model, so async callers run it in an executor.
+        """
+        if not texts:
+            return []
+        import numpy as np
+        
+        with self._embedding_lock:
+            cache = self._embedding_cache
+            unique = list(dict.fromkeys(texts))
+            for text in unique:
+                if text in cache:
+                    cache.move_to_end(text)
+            
+            # Encode each distinct uncached text once, longest first so batches pad evenly
+            missing = sorted((text for text in unique if text not in cache), key=len, reverse=True)
+            if missing:
+                embeddings = self.embedding_model.encode(
+                    missing, batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+                )
+                cache.update(zip(missing, embeddings))
+            
+            # Gather the rows before evicting, in case this call alone overflows the cache
+            result = np.stack([cache[text] for text in texts])
+            while len(cache) > _EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+            return result
 
-        # Common computer science topics and their relationships
-        self.cs_topic_relationships = {
-            'algorithms': ['data structures', 'complexity analysis', 'optimization'],
-            'data structures': ['algorithms', 'memory management', 'performance'],
-            'object-oriented': ['inheritance', 'polymorphism', 'encapsulation'],
-            'databases': ['normalization', 'indexing', 'transactions'],
-            'networking': ['protocols', 'routing', 'security'],
-            'operating systems': ['processes', 'memory', 'scheduling']
-        }
+    def _similar_texts(self, pool: List[str], targets: List[str], k: int) -> Dict[str, List[str]]:
+        """Pick the k pool texts most similar to each target, excluding itself.
 
-        # Domain-specific question patterns
-        self.domain_patterns = {
-            'concept': {
-                'definition': [
-                    "What is the definition of {concept}?",
-                    "Which of the following best describes {concept}?",
-                    "What does {concept} refer to in this context?"
-                ],
-                'application': [
-                    "How would you apply {concept} in a real-world scenario?",
-                    "Which situation best demonstrates the use of {concept}?",
-                    "In what context would {concept} be most relevant?"
-                ],
-                'analysis': [
-                    "What are the key components of {concept}?",
-                    "How does {concept} relate to {related_concept}?",
-                    "What are the implications of {concept}?"
-                ]
-            },
-            'relationship': {
-                'causal': [
-                    "What is the relationship between {concept1} and {concept2}?",
-                    "How does {concept1} affect {concept2}?",
-                    "What happens to {concept2} when {concept1} changes?",
-                    "Which statement best describes how {concept1} influences {concept2}?"
-                ],
-                'comparative': [
-                    "How does {concept1} differ from {concept2}?",
-                    "What are the similarities between {concept1} and {concept2}?",
-                    "Which statement best compares {concept1} and {concept2}?",
-                    "What distinguishes {concept1} from {concept2}?"
-                ],
-                'hierarchical': [
-                    "Which of the following is a subset of {concept1}?",
-                    "What category does {concept1} belong to?",
-                    "How is {concept1} classified in relation to {concept2}?",
-                    "Which statement best describes the hierarchy between {concept1} and {concept2}?"
-                ]
-            },
-            'application': {
-                'problem_solving': [
-                    "How would you solve this problem using {concept}?",
-                    "Which approach would be most effective for this scenario?",
-                    "What steps would you take to apply {concept} here?",
-                    "How would you use {concept} to address this situation?"
-                ],
-                'evaluation': [
-                    "Which solution best demonstrates the principles of {concept}?",
-                    "How would you evaluate the effectiveness of {concept} in this case?",
-                    "What criteria would you use to assess the application of {concept}?",
-                    "Which approach best exemplifies the use of {concept}?"
-                ],
-                'synthesis': [
-                    "How would you combine {concept1} and {concept2} to solve this problem?",
-                    "What new insights can be gained by applying {concept} in this context?",
-                    "How would you integrate {concept} with existing knowledge?",
-                    "Which approach best synthesizes {concept1} and {concept2}?"
-                ]
-            }
-        }
+        The pool is embedded in one batched call and every target is scored
+        against it with a single matrix product. Targets must come from the
+        pool. Returns {} when the embedding model is unavailable, so callers
+        can fall back to random picks.
+        """
+        if not targets or k <= 0:
+            return {}
+        try:
+            embeddings = self._encode(pool)
+        except Exception as e:
+            logger.warning(f"Embedding model unavailable, falling back to random distractors: {str(e)}")
+            return {}
         
-        # Domain-specific difficulty indicators
-        self.difficulty_indicators = {
-            'easy': {
-                'keywords': ['define', 'identify', 'list', 'describe', 'explain'],
-                'complexity': 'basic understanding'
-            },
-            'medium': {
-                'keywords': ['compare', 'contrast', 'analyze', 'apply', 'evaluate'],
-                'complexity': 'application and analysis'
-            },
-            'hard': {
-                'keywords': ['synthesize', 'create', 'design', 'critique', 'justify'],
-                'complexity': 'synthesis and evaluation'
-            }
-        }
+        rows = {text: i for i, text in enumerate(pool)}
+        target_rows = [rows[target] for target in targets]
+        # Cosine similarities, as the embeddings are normalized
+        scores = embeddings[target_rows] @ embeddings.T
+        
+        similar = {}
+        for target, row, target_scores in zip(targets, target_rows, scores):
+            target_scores[row] = -2.0  # below any cosine, so never picked
+            best = target_scores.argsort()[::-1][:k]
+            similar[target] = [pool[j] for j in best]
+        return similar
 
-        # Domain detection patterns
-        self.domain_indicators = {
-            'computer_science': [
-                'algorithm', 'data structure', 'programming', 'software',
-                'database', 'network', 'security', 'web development'
-            ],
-            'language_learning': [
-                'vocabulary', 'grammar', 'reading', 'writing',
-                'pronunciation', 'speaking', 'listening'
-            ],
-            'mathematics': [
-                'algebra', 'calculus', 'geometry', 'statistics',
-                'equation', 'function', 'theorem', 'proof'
-            ],
-            'science': [
-                'physics', 'chemistry', 'biology', 'experiment',
-                'theory', 'hypothesis', 'research', 'analysis'
-            ],
-            'history': [
-                'period', 'era', 'century', 'event',
-                'civilization', 'culture', 'war', 'revolution'
-            ],
-            'business': [
-                'management', 'marketing', 'finance', 'economics',
-                'strategy', 'organization', 'leadership', 'entrepreneurship'
-            ]
-        }
+    @classmethod
+    async def _get_session(cls) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if cls._http_session is None or cls._http_session.closed:
+            cls._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+            # Created alongside the session so it binds to the running loop
+            cls._api_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_LOOKUPS)
+        return cls._http_session
 
-        # Generic question patterns for any domain
-        self.generic_domain_patterns = {
-            'concept': {
-                'definition': [
-                    "What is the definition of {concept}?",
-                    "Which of the following best describes {concept}?",
-                    "What does {concept} refer to in this context?"
-                ],
-                'application': [
-                    "How would you apply {concept} in a real-world scenario?",
-                    "Which situation best demonstrates the use of {concept}?",
-                    "In what context would {concept} be most relevant?"
-                ],
-                'analysis': [
-                    "What are the key components of {concept}?",
-                    "How does {concept} relate to {related_concept}?",
-                    "What are the implications of {concept}?"
-                ]
-            },
-            'process': {
-                'steps': [
-                    "What is the correct sequence of steps for {process}?",
-                    "Which step comes first in {process}?",
-                    "What is the final step in {process}?"
-                ],
-                'purpose': [
-                    "What is the main purpose of {process}?",
-                    "Why is {process} important?",
-                    "What problem does {process} solve?"
-                ],
-                'evaluation': [
-                    "How would you evaluate the effectiveness of {process}?",
-                    "What criteria would you use to assess {process}?",
-                    "How can you measure the success of {process}?"
-                ]
-            },
-            'analysis': {
-                'comparison': [
-                    "How does {concept1} compare to {concept2}?",
-                    "What are the similarities between {concept1} and {concept2}?",
-                    "What are the key differences between {concept1} and {concept2}?"
-                ],
-                'evaluation': [
-                    "What are the strengths and weaknesses of {concept}?",
-                    "How effective is {concept} in achieving its goals?",
-                    "What are the limitations of {concept}?"
-                ],
-                'synthesis': [
-                    "How would you combine {concept1} and {concept2} to solve this problem?",
-                    "What new insights can be gained by applying {concept} in this context?",
-                    "How would you integrate {concept} with existing knowledge?"
-                ]
-            }
-        }
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP session and analysis pool. Called on application shutdown."""
+        if cls._http_session is not None and not cls._http_session.closed:
+            await cls._http_session.close()
+        cls._http_session = None
+        if cls._analysis_pool is not None:
+            cls._analysis_pool.shutdown(wait=False)
+            cls._analysis_pool = None
+
+    @classmethod
+    def _get_analysis_pool(cls) -> ProcessPoolExecutor:
+        """Return the shared analysis process pool, creating it on first use."""
+        if cls._analysis_pool is None:
+            # Spawned rather than forked, so workers don't inherit the server's
+            # event loop, sockets or the embedding warm-up thread
+            cls._analysis_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return cls._analysis_pool
+
+    @classmethod
+    def _discard_analysis_pool(cls, pool: ProcessPoolExecutor) -> None:
+        """Shut down a broken analysis pool, unless it has already been replaced."""
+        if cls._analysis_pool is pool:
+            cls._analysis_pool = None
+        pool.shutdown(wait=False)
+
+    async def _get_word_resources(self, word: str) -> Dict[str, Any]:
+        """Return external resources for a word, fetching each word at most once."""
+        key = word.lower()
+        
+        cached = self._word_cache.get(key)
+        if cached is not None:
+            self._word_cache.move_to_end(key)
+            return cached
+        
+        # Join a lookup for the same word that is already in flight
+        lookup = self._word_lookups.get(key)
+        if lookup is not None:
+            return await asyncio.shield(lookup)
+        
+        lookup = asyncio.ensure_future(self._fetch_external_resources(key))
+        self._word_lookups[key] = lookup
+        try:
+            data = await lookup
+        finally:
+            del self._word_lookups[key]
+        
+        # Failed lookups come back empty; leave them uncached so they are retried
+        if data:
+            self._word_cache[key] = data
+            if len(self._word_cache) > _WORD_CACHE_SIZE:
+                self._word_cache.popitem(last=False)
+        return data
 
     async def _fetch_external_resources(self, word: str) -> Dict[str, Any]:
         """Fetch additional information from external resources."""
         try:
-            # Fetch from dictionary API
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.external_resources['dictionary_api']}{word}") as response:
+            session = await self._get_session()
+            timeout = aiohttp.ClientTimeout(total=_LOOKUP_TIMEOUT)
+            
+            async with self._api_semaphore:
+                # Fetch from dictionary API
+                async with session.get(f"{self.external_resources['dictionary_api']}{word}", timeout=timeout) as response:
                     if response.status == 200:
-                        dictionary_data = await response.json()
+                        dictionary_data = self._compact_dictionary_data(orjson.loads(await response.read()))
                     else:
                         dictionary_data = None
 
                 # Fetch from thesaurus API
-                async with session.get(f"{self.external_resources['thesaurus_api']}?ml={word}") as response:
+                async with session.get(f"{self.external_resources['thesaurus_api']}?ml={word}", timeout=timeout) as response:
                     if response.status == 200:
-                        thesaurus_data = await response.json()
+                        thesaurus_data = [{'word': entry['word']} for entry in orjson.loads(await response.read())]
                     else:
                         thesaurus_data = None
 
@@ -405,13 +970,42 @@ class QuestionGenerator:
                 'dictionary': dictionary_data,
                 'thesaurus': thesaurus_data
             }
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching external resources for '{word}'")
+            return {}
         except Exception as e:
             logger.error(f"Error fetching external resources: {str(e)}")
             return {}
 
+    @staticmethod
+    def _compact_dictionary_data(data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Keep only the dictionary fields used for options, in the API's shape.
+
+        The first example found among a meaning's definitions is lifted onto
+        the meaning so usage questions can read it directly.
+        """
+        if not isinstance(data, list) or not data:
+            return None
+        
+        meanings = []
+        for meaning in data[0].get('meanings', []):
+            definitions = meaning.get('definitions', [])
+            compact = {
+                'definitions': [{'definition': d['definition']} for d in definitions if 'definition' in d],
+                'antonyms': meaning.get('antonyms', [])
+            }
+            example = next((d['example'] for d in definitions if d.get('example')), None)
+            if example:
+                compact['example'] = example
+            meanings.append(compact)
+        
+        return [{'meanings': meanings}]
+
     async def _generate_language_questions(self, content: str, analysis: Dict[str, Any], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
         """Generate language learning questions."""
-        questions = []
+        vocab_questions = []
+        grammar_questions = []
+        reading_questions = []
         
         try:
             logger.info("Starting language question generation")
@@ -422,17 +1016,19 @@ class QuestionGenerator:
             
             if vocabulary:
                 # Generate vocabulary questions
-                vocab_questions = await self._generate_vocabulary_questions(
-                    vocabulary,
-                    analysis,
-                    count // 3,
-                    chapter
-                )
+                vocab_questions = [
+                    question async for question in self._iter_vocabulary_questions(
+                        vocabulary,
+                        analysis,
+                        count // 3,
+                        chapter
+                    )
+                ]
                 logger.info(f"Generated {len(vocab_questions)} vocabulary questions")
-                questions.extend(vocab_questions)
             
             # Extract grammar structures
-            grammar_structures = self._extract_grammar_structures(content)
+            # Only the first count // 3 structures are ever used, so stop parsing there
+            grammar_structures = self._extract_grammar_structures(content, limit=count // 3)
             logger.info(f"Extracted {len(grammar_structures)} grammar structures")
             
             if grammar_structures:
@@ -444,10 +1040,9 @@ class QuestionGenerator:
                     chapter
                 )
                 logger.info(f"Generated {len(grammar_questions)} grammar questions")
-                questions.extend(grammar_questions)
             
             # Extract reading passages
-            reading_passages = self._extract_reading_passages(content)
+            reading_passages = self._extract_reading_passages(content, limit=count // 3)
             logger.info(f"Extracted {len(reading_passages)} reading passages")
             
             if reading_passages:
@@ -459,7 +1054,8 @@ class QuestionGenerator:
                     chapter
                 )
                 logger.info(f"Generated {len(reading_questions)} reading questions")
-                questions.extend(reading_questions)
+            
+            questions = list(itertools.chain(vocab_questions, grammar_questions, reading_questions))
             
             # If no specific questions were generated, create basic language questions
             if not questions:
@@ -473,21 +1069,54 @@ class QuestionGenerator:
             logger.error(f"Error in _generate_language_questions: {str(e)}", exc_info=True)
             return []
 
+    def _tokenize(self, content: str) -> Dict[str, Any]:
+        """Sentence-split, tokenize and POS-tag content once, cached by content hash."""
+        key = _content_digest(content)
+        
+        cached = self._nlp_cache.get(key)
+        if cached is not None:
+            self._nlp_cache.move_to_end(key)
+            return cached
+        
+        sentences = _sent_tokenize(content)
+        # Tag all sentences in one batched tagger call
+        sentence_tags = nltk.pos_tag_sents([nltk.word_tokenize(sentence) for sentence in sentences])
+        pos_tags = [tagged for tags in sentence_tags for tagged in tags]
+        
+        tokens = {
+            'sentences': sentences,
+            'sentence_tags': sentence_tags,
+            'words': [word for word, _ in pos_tags],
+            'pos_tags': pos_tags
+        }
+        
+        self._nlp_cache[key] = tokens
+        if len(self._nlp_cache) > _NLP_CACHE_SIZE:
+            self._nlp_cache.popitem(last=False)
+        return tokens
+
     def _extract_vocabulary(self, content: str) -> List[Dict[str, Any]]:
         """Extract vocabulary words and their context."""
         vocabulary = []
         
         try:
-            # Use NLTK for word extraction
-            words = nltk.word_tokenize(content)
-            pos_tags = nltk.pos_tag(words)
-            
-            for word, tag in pos_tags:
-                if tag.startswith(('NN', 'VB', 'JJ', 'RB')):  # Nouns, verbs, adjectives, adverbs
+            # Use the cached NLTK tokens and tags for the content
+            tokens = self._tokenize(content)
+            words = tokens['words']
+            pos_tags = tokens['pos_tags']
+            seen = set()
+            
+            for i, (word, tag) in enumerate(pos_tags):
+                if tag[:2] in _VOCAB_TAG_PREFIXES:
+                    # Keep only the first occurrence of each word
+                    word_lower = word.lower()
+                    if word_lower in seen:
+                        continue
+                    seen.add(word_lower)
+                    
                     # Get word context (surrounding words)
-                    word_index = words.index(word)
-                    start = max(0, word_index - 5)
-                    end = min(len(words), word_index + 6)
+                    start = max(0, i - 5)
+                    end = min(len(words), i + 6)
                     context = ' '.join(words[start:end])
                     
                     vocabulary.append({
@@ -509,22 +1138,23 @@ class QuestionGenerator:
         
         return vocabulary
 
-    def _extract_grammar_structures(self, content: str) -> List[Dict[str, Any]]:
-        """Extract grammar structures from content."""
+    def _extract_grammar_structures(self, content: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract grammar structures from content, parsing at most `limit` sentences."""
         structures = []
         
-        # Use NLTK for sentence parsing
-        sentences = nltk.sent_tokenize(content)
+        # Reuse the cached per-sentence POS tags for parsing
+        tokens = self._tokenize(content)
         
-        for sentence in sentences:
-            # Parse sentence structure
-            tree = nltk.ne_chunk(nltk.pos_tag(nltk.word_tokenize(sentence)))
+        for sentence, sentence_tags in zip(tokens['sentences'][:limit], tokens['sentence_tags']):
+            # Shallow-parse sentence structure (NP/VP chunks)
+            tree = self._chunker.parse(sentence_tags)
             
             # Extract grammar patterns
             patterns = self._extract_grammar_patterns(tree)
             
             structures.append({
                 'sentence': sentence,
+                'pos_tags': sentence_tags,
                 'patterns': patterns
             })
         
@@ -567,70 +1197,92 @@ class QuestionGenerator:
                 'words': []
             }]
 
-    def _extract_reading_passages(self, content: str) -> List[Dict[str, Any]]:
-        """Extract reading passages for comprehension questions."""
+    def _extract_reading_passages(self, content: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract up to `limit` reading passages for comprehension questions."""
         passages = []
         
-        # Split content into paragraphs
-        paragraphs = content.split('\n\n')
-        
-        for paragraph in paragraphs:
-            if len(paragraph.split()) > 50:  # Only use substantial paragraphs
+        for paragraph in content.split('\n\n'):
+            if limit is not None and len(passages) >= limit:
+                break
+            # Only use substantial paragraphs (more than _MIN_PASSAGE_WORDS words)
+            if _has_words(paragraph, _MIN_PASSAGE_WORDS + 1):
+                # Split once and share the sentences between both extractors
+                sentences = _sent_tokenize(paragraph)
+                main_idea = self._extract_main_idea(paragraph, sentences)
                 passages.append({
                     'text': paragraph,
-                    'main_idea': self._extract_main_idea(paragraph),
-                    'key_points': self._extract_key_points(paragraph)
+                    'sentences': sentences,
+                    'main_idea': main_idea,
+                    # Distractor pool for the main idea and inference options
+                    'other_sentences': tuple(s for s in sentences if s != main_idea),
+                    'key_points': self._extract_key_points(paragraph, sentences)
                 })
         
         return passages
 
-    async def _generate_vocabulary_questions(self, vocabulary: List[Dict[str, Any]], analysis: Dict[str, Any], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
-        """Generate vocabulary questions."""
-        questions = []
+    async def _iter_vocabulary_questions(self, vocabulary: List[Dict[str, Any]], analysis: Dict[str, Any], count: int, chapter: Chapter) -> AsyncIterator[QuestionCreateSchema]:
+        """Yield vocabulary questions as soon as each word's lookup is available."""
+        selected_words = vocabulary[:count]
+        
+        # Start every distinct word's lookup at once over the shared session,
+        # then consume them in word order so the seeded RNG stays reproducible
+        lookups = {
+            key: asyncio.ensure_future(self._get_word_resources(key))
+            for key in dict.fromkeys(word_data['word'].lower() for word_data in selected_words)
+        }
+        
+        # Draw a template per (word, question type) up front rather than
+        # looking the pattern list up on every iteration
+        vocab_patterns = self.language_domain_patterns['vocabulary']
+        chosen_patterns = {
+            q_type: self._random.choices(vocab_patterns[q_type], k=len(selected_words))
+            for q_type in _VOCAB_QUESTION_TYPES
+        }
         
-        for word_data in vocabulary[:count]:
+        produced = 0
+        for i, word_data in enumerate(selected_words):
             word = word_data['word']
-            
-            # Get external resources for the word
-            external_data = await self._fetch_external_resources(word)
+            try:
+                external_data = await lookups[word.lower()]
+            except Exception as e:
+                logger.error(f"Error fetching external resources for '{word}': {str(e)}")
+                external_data = {}
             
             # Generate different types of vocabulary questions
-            question_types = ['definition', 'synonym', 'antonym', 'usage']
-            
-            for q_type in question_types:
-                if len(questions) >= count:
-                    break
+            for q_type in _VOCAB_QUESTION_TYPES:
+                if produced >= count:
+                    # Lookups still running finish in the background and warm the cache
+                    return
                 
-                # Get question pattern
-                pattern = random.choice(self.language_domain_patterns['vocabulary'][q_type])
-                question_text = pattern.format(word=word)
+                pattern = chosen_patterns[q_type][i]
+                # Vocabulary templates have a single placeholder, so a plain
+                # substitution avoids re-parsing the format string every time
+                question_text = pattern.replace('{word}', word)
                 
                 # Generate options based on external data
                 options = self._generate_vocabulary_options(word, q_type, external_data)
                 
                 if len(options) >= 4:
-                    question = self._create_question_schema(
+                    produced += 1
+                    yield self._create_question_schema(
                         question_text=question_text,
                         options=options,
                         difficulty=self._determine_language_difficulty(q_type),
                         chapter_id=chapter.id
                     )
-                    questions.append(question)
-            
-            return questions
 
     def _create_question_schema(self, question_text: str, options: List[str], difficulty: str, chapter_id: int) -> QuestionCreateSchema:
         """Helper function to create a question schema with randomized correct answer position."""
         # 1. Shuffle but keep original index
         correct_text = options[0]
         shuffled = options[:]  # copy
-        random.shuffle(shuffled)
+        self._random.shuffle(shuffled)
 
         # 2. Re-letter into a dict
-        lettered = {chr(65 + i): opt for i, opt in enumerate(shuffled)}
+        lettered = dict(zip(_LETTERS, shuffled))
 
         # 3. Find which letter now holds the correct answer
-        correct_letter = next(letter for letter, text in lettered.items() if text == correct_text)
+        correct_letter = _LETTERS[shuffled.index(correct_text)]
 
         # 4. Build the question schema
         return QuestionCreateSchema(
@@ -647,48 +1299,45 @@ class QuestionGenerator:
         options = []
         
         try:
+            # Dictionary entries are compacted to [{'meanings': [...]}]; a word
+            # with no meanings simply falls through to the generic options
+            dictionary = external_data.get('dictionary')
+            meanings = dictionary[0].get('meanings', []) if dictionary else []
+            
             if q_type == 'definition':
-                # Get definitions from external data
-                if external_data.get('dictionary'):
-                    definitions = [meaning['definition'] for meaning in external_data['dictionary'][0]['meanings'][0]['definitions']]
-                    options.extend(definitions[:3])  # Use up to 3 definitions
+                # Get definitions from the first meaning
+                if meanings:
+                    definitions = (meaning['definition'] for meaning in meanings[0]['definitions'])
+                    options.extend(itertools.islice(definitions, 3))  # Use up to 3 definitions
                 
                 # If not enough definitions, add some generic ones
-                while len(options) < 4:
-                    options.append(f"A word related to {word}")
+                options.extend([f"A word related to {word}"] * (4 - len(options)))
             
             elif q_type == 'synonym':
                 # Get synonyms from external data
                 if external_data.get('thesaurus'):
-                    synonyms = [syn['word'] for syn in external_data['thesaurus'] if syn['word'] != word]
-                    options.extend(synonyms[:3])  # Use up to 3 synonyms
+                    # The thesaurus returns up to 100 entries; stop after the first 3 usable ones
+                    synonyms = (syn['word'] for syn in external_data['thesaurus'] if syn['word'] != word)
+                    options.extend(itertools.islice(synonyms, 3))  # Use up to 3 synonyms
                 
                 # If not enough synonyms, add some generic ones
-                while len(options) < 4:
-                    options.append(f"Another word for {word}")
+                options.extend([f"Another word for {word}"] * (4 - len(options)))
             
             elif q_type == 'antonym':
                 # Get antonyms from external data
-                if external_data.get('dictionary'):
-                    antonyms = []
-                    for meaning in external_data['dictionary'][0]['meanings']:
-                        if 'antonyms' in meaning:
-                            antonyms.extend(meaning['antonyms'])
-                    options.extend(antonyms[:3])  # Use up to 3 antonyms
+                antonyms = itertools.chain.from_iterable(meaning.get('antonyms', ()) for meaning in meanings)
+                options.extend(itertools.islice(antonyms, 3))  # Use up to 3 antonyms
                 
                 # If not enough antonyms, add some generic ones
-                while len(options) < 4:
-                    options.append(f"Opposite of {word}")
+                options.extend([f"Opposite of {word}"] * (4 - len(options)))
             
             else:  # usage
                 # Generate example sentences
-                if external_data.get('dictionary'):
-                    examples = [meaning['example'] for meaning in external_data['dictionary'][0]['meanings'] if 'example' in meaning]
-                    options.extend(examples[:3])  # Use up to 3 examples
+                examples = (meaning['example'] for meaning in meanings if 'example' in meaning)
+                options.extend(itertools.islice(examples, 3))  # Use up to 3 examples
                 
                 # If not enough examples, add some generic ones
-                while len(options) < 4:
-                    options.append(f"Example sentence using {word}")
+                options.extend([f"Example sentence using {word}"] * (4 - len(options)))
             
             # Ensure we have exactly 4 options
             if len(options) > 4:
@@ -722,6 +1371,10 @@ class QuestionGenerator:
         for structure in structures[:count]:
             sentence = structure['sentence']
             patterns = structure['patterns']
+            # Tagged once per chapter in _tokenize and carried on the structure;
+            # every question type below shares these tokens and tags
+            pos_tags = structure['pos_tags']
+            words = [word for word, _ in pos_tags]
             
             # Generate different types of grammar questions
             question_types = ['structure', 'tenses', 'parts_of_speech']
@@ -731,19 +1384,17 @@ class QuestionGenerator:
                     break
                 
                 # Get question pattern
-                pattern = random.choice(self.language_domain_patterns['grammar'][q_type])
+                pattern = self._random.choice(self.language_domain_patterns['grammar'][q_type])
                 
                 if q_type == 'parts_of_speech':
-                    # Select a word from the sentence
-                    words = nltk.word_tokenize(sentence)
-                    word = random.choice(words)
-                    pos = nltk.pos_tag([word])[0][1]
+                    # Select a word from the sentence, tagged in context
+                    word, pos = self._random.choice(pos_tags)
                     question_text = pattern.format(word=word, part_of_speech=pos)
                 else:
                     question_text = pattern
                 
                 # Generate options
-                options = self._generate_grammar_options(sentence, q_type, patterns)
+                options = self._generate_grammar_options(sentence, q_type, patterns, words, pos_tags)
                 
                 if len(options) >= 4:
                     question = self._create_question_schema(
@@ -756,86 +1407,90 @@ class QuestionGenerator:
         
         return questions
 
-    def _generate_grammar_options(self, sentence: str, q_type: str, patterns: List[Dict[str, Any]]) -> List[str]:
-        """Generate options for grammar questions."""
-        options = []
+    def _change_mask(self, n: int, rate: float = 0.3) -> List[bool]:
+        """Draw which of n words to change, each with probability `rate`."""
+        rand = self._random.random
+        return [rand() < rate for _ in range(n)]
+
+    def _grammar_structure_options(self, sentence: str, words: List[str]) -> List[str]:
+        """Distractors that reorder or replace the sentence's words."""
+        # Original structure
+        options = [sentence]
+        
+        # Generate variations
+        if len(words) >= 4:
+            # Change word order
+            words_copy = words.copy()
+            self._random.shuffle(words_copy)
+            options.append(' '.join(words_copy))
+            
+            # Change some words (30% chance each), drawing the mask in one pass
+            changed = self._change_mask(len(words))
+            options.append(' '.join(
+                f"word{i}" if change else word
+                for i, (word, change) in enumerate(zip(words, changed))
+            ))
+            
+            # Add a completely different sentence
+            options.append("This is a different sentence structure.")
+        
+        return options
+
+    def _grammar_tense_options(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[str]:
+        """Distractors that mark the sentence's verbs as past or future tense."""
+        # Original tense
+        options = [sentence]
+        
+        # Build the past and future variants in a single pass over the tags
+        past_words = []
+        future_words = []
+        for word, tag in pos_tags:
+            if tag.startswith('VB'):  # Verb
+                past_words.append(f"past_{word}")
+                future_words.append(f"will_{word}")
+            else:
+                past_words.append(word)
+                future_words.append(word)
+        options.append(' '.join(past_words))
+        options.append(' '.join(future_words))
         
+        # Add a completely different tense
+        options.append("This is a different tense.")
+        return options
+
+    def _grammar_pos_options(self, sentence: str, words: List[str], pos_tags: List[Tuple[str, str]]) -> List[str]:
+        """Distractors that swap nouns, verbs and adjectives for placeholders."""
+        # Original
+        options = [sentence]
+        
+        # Change some parts of speech (30% chance each word)
+        words_copy = words.copy()
+        changed = self._change_mask(len(pos_tags))
+        # Visit only the positions selected by the mask
+        for i in itertools.compress(range(len(pos_tags)), changed):
+            tag = pos_tags[i][1]
+            if tag.startswith('NN'):  # Noun
+                words_copy[i] = f"noun{i}"
+            elif tag.startswith('VB'):  # Verb
+                words_copy[i] = f"verb{i}"
+            elif tag.startswith('JJ'):  # Adjective
+                words_copy[i] = f"adj{i}"
+        options.append(' '.join(words_copy))
+        
+        # Add more variations
+        options.append("This is a different part of speech.")
+        options.append("Another part of speech variation.")
+        return options
+
+    def _generate_grammar_options(self, sentence: str, q_type: str, patterns: List[Dict[str, Any]], words: List[str], pos_tags: List[Tuple[str, str]]) -> List[str]:
+        """Generate options for grammar questions from the sentence's shared tokens and tags."""
         try:
             if q_type == 'structure':
-                # Generate different sentence structures
-                words = nltk.word_tokenize(sentence)
-                pos_tags = nltk.pos_tag(words)
-                
-                # Original structure
-                options.append(sentence)
-                
-                # Generate variations
-                if len(words) >= 4:
-                    # Change word order
-                    words_copy = words.copy()
-                    random.shuffle(words_copy)
-                    options.append(' '.join(words_copy))
-                    
-                    # Change some words
-                    words_copy = words.copy()
-                    for i in range(len(words_copy)):
-                        if random.random() < 0.3:  # 30% chance to change each word
-                            words_copy[i] = f"word{i}"
-                    options.append(' '.join(words_copy))
-                    
-                    # Add a completely different sentence
-                    options.append("This is a different sentence structure.")
-            
+                options = self._grammar_structure_options(sentence, words)
             elif q_type == 'tenses':
-                # Generate different tense variations
-                options.append(sentence)  # Original tense
-                
-                # Past tense
-                words = nltk.word_tokenize(sentence)
-                pos_tags = nltk.pos_tag(words)
-                past_words = []
-                for word, tag in pos_tags:
-                    if tag.startswith('VB'):  # Verb
-                        past_words.append(f"past_{word}")
-                    else:
-                        past_words.append(word)
-                options.append(' '.join(past_words))
-                
-                # Future tense
-                future_words = []
-                for word, tag in pos_tags:
-                    if tag.startswith('VB'):  # Verb
-                        future_words.append(f"will_{word}")
-                    else:
-                        future_words.append(word)
-                options.append(' '.join(future_words))
-                
-                # Add a completely different tense
-                options.append("This is a different tense.")
-            
+                options = self._grammar_tense_options(sentence, pos_tags)
             else:  # parts_of_speech
-                # Generate different parts of speech
-                words = nltk.word_tokenize(sentence)
-                pos_tags = nltk.pos_tag(words)
-                
-                # Original
-                options.append(sentence)
-                
-                # Change some parts of speech
-                words_copy = words.copy()
-                for i, (word, tag) in enumerate(pos_tags):
-                    if random.random() < 0.3:  # 30% chance to change each word
-                        if tag.startswith('NN'):  # Noun
-                            words_copy[i] = f"noun{i}"
-                        elif tag.startswith('VB'):  # Verb
-                            words_copy[i] = f"verb{i}"
-                        elif tag.startswith('JJ'):  # Adjective
-                            words_copy[i] = f"adj{i}"
-                options.append(' '.join(words_copy))
-                
-                # Add more variations
-                options.append("This is a different part of speech.")
-                options.append("Another part of speech variation.")
+                options = self._grammar_pos_options(sentence, words, pos_tags)
             
             # Ensure we have exactly 4 options
             if len(options) > 4:
@@ -875,11 +1530,11 @@ class QuestionGenerator:
                     break
                 
                 # Get question pattern
-                pattern = random.choice(self.language_domain_patterns['reading_comprehension'][q_type])
+                pattern = self._random.choice(self.language_domain_patterns['reading_comprehension'][q_type])
                 
                 if q_type == 'details':
                     # Select a topic from key points
-                    topic = random.choice(passage['key_points'])
+                    topic = self._random.choice(passage['key_points'])
                     question_text = pattern.format(topic=topic)
                 else:
                     question_text = pattern
@@ -907,10 +1562,9 @@ class QuestionGenerator:
                 # Use the main idea as correct answer
                 options.append(passage['main_idea'])
                 
-                # Generate plausible alternatives
-                sentences = nltk.sent_tokenize(passage['text'])
-                other_sentences = [s for s in sentences if s != passage['main_idea']]
-                options.extend(random.sample(other_sentences, min(3, len(other_sentences))))
+                # Generate plausible alternatives from the passage's own sentences
+                other_sentences = passage['other_sentences']
+                options.extend(self._random.sample(other_sentences, min(3, len(other_sentences))))
             
             elif q_type == 'details':
                 # Use key points as options
@@ -921,10 +1575,8 @@ class QuestionGenerator:
                 main_idea = passage['main_idea']
                 options.append(f"Based on the text, {main_idea}")
                 
-                # Generate plausible alternatives
-                sentences = nltk.sent_tokenize(passage['text'])
-                other_sentences = [s for s in sentences if s != main_idea]
-                for sentence in other_sentences[:3]:
+                # Generate plausible alternatives from the first 3 other sentences
+                for sentence in passage['other_sentences'][:3]:
                     options.append(f"Based on the text, {sentence}")
             
             # Ensure we have exactly 4 options
@@ -954,31 +1606,123 @@ class QuestionGenerator:
 
     def _determine_language_difficulty(self, question_type: str) -> str:
         """Determine difficulty level for language questions."""
-        difficulty_map = {
-            'definition': 'easy',
-            'synonym': 'medium',
-            'antonym': 'medium',
-            'usage': 'hard',
-            'structure': 'medium',
-            'tenses': 'hard',
-            'parts_of_speech': 'medium',
-            'main_idea': 'easy',
-            'details': 'medium',
-            'inference': 'hard'
-        }
-        return difficulty_map.get(question_type, 'medium')
+        return _LANGUAGE_DIFFICULTY.get(question_type, 'medium')
 
     async def generate_questions(self, chapter: Chapter, num_questions: int = 5) -> List[QuestionCreateSchema]:
-        """Generate questions based on content domain."""
+        """Generate questions based on content domain.
+
+        Results are cached per chapter content and question count, and the
+        random choices are seeded from the content hash so that repeated
+        requests for the same content return the same questions. The cache
+        is shared between chapters, so a re-uploaded chapter reuses the
+        questions of an identical one. Concurrent requests for content that
+        is already being generated share the running generation instead of
+        starting another one.
+        """
+        content_hash = _content_digest(chapter.content or '')
+        cache_key = (content_hash, num_questions)
+        
+        cached = _QUESTION_CACHE.get(cache_key)
+        if cached is not None:
+            _QUESTION_CACHE.move_to_end(cache_key)
+            logger.info(f"Returning {len(cached)} cached questions for chapter {chapter.id}")
+            return self._for_chapter(cached, chapter.id)
+        
+        # Concurrent requests for the same content wait on the one already running
+        pending = _IN_FLIGHT.get(cache_key)
+        if pending is not None:
+            logger.info(f"Waiting for in-flight question generation for chapter {chapter.id}")
+            return self._for_chapter(await asyncio.shield(pending), chapter.id)
+        
+        future = asyncio.get_running_loop().create_future()
+        _IN_FLIGHT[cache_key] = future
         try:
-            # Analyze content
-            content_analysis = self._analyze_content(chapter.content)
+            self._random = random.Random(int.from_bytes(content_hash[:8], "little"))
+            questions = await self._generate_questions(chapter, num_questions)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(questions)
+        finally:
+            del _IN_FLIGHT[cache_key]
+        
+        if questions:
+            _QUESTION_CACHE[cache_key] = questions
+            if len(_QUESTION_CACHE) > _QUESTION_CACHE_SIZE:
+                _QUESTION_CACHE.popitem(last=False)
+        
+        return list(questions)
+
+    @staticmethod
+    def _for_chapter(questions: List[QuestionCreateSchema], chapter_id: int) -> List[QuestionCreateSchema]:
+        """Return shared questions, re-pointed at chapter_id if generated for another chapter.
+
+        Generation is seeded by content alone, so for identical content the
+        questions differ only in their chapter id.
+        """
+        return [
+            question if question.chapter_id == chapter_id
+            else question.model_copy(update={'chapter_id': chapter_id})
+            for question in questions
+        ]
+
+    async def _analyze_chapter(self, content: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Analyze content and detect its domains once, cached by content hash.
+
+        The analysis is only read by the question generators, so the cached
+        result is shared between generations for the same content. Long
+        chapters are analysed in a worker process so the CPU-bound regex work
+        neither blocks the event loop nor holds this process' GIL.
+        """
+        if not content:
+            return self._analyze_content(content), []
+        
+        key = _content_digest(content)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return cached
+        
+        if len(content) >= _ANALYSIS_POOL_MIN_CHARS:
+            loop = asyncio.get_running_loop()
+            pool = self._get_analysis_pool()
+            try:
+                analysis, domains = await loop.run_in_executor(pool, _analyze_in_worker, content)
+            except BrokenProcessPool as e:
+                # A worker died (e.g. OOM-killed) and the pool can't run tasks
+                # any more; drop it so the next call starts a fresh one
+                logger.warning(f"Analysis pool broken, analysing chapter inline: {str(e)}")
+                self._discard_analysis_pool(pool)
+                analysis, domains = self._analyze_content(content), self._detect_domain(content)
+        else:
+            analysis, domains = self._analyze_content(content), self._detect_domain(content)
+        
+        # Freeze the aggregated sets so the shared cached copy can't be changed
+        for field in _ANALYSIS_SET_FIELDS:
+            if field in analysis:
+                analysis[field] = frozenset(analysis[field])
+        
+        result = (analysis, domains)
+        self._analysis_cache[key] = result
+        if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return result
+
+    async def _generate_questions(self, chapter: Chapter, num_questions: int) -> List[QuestionCreateSchema]:
+        """Run the domain-based question generation pipeline."""
+        try:
+            # Analyze content and detect domain(s)
+            content_analysis, domains = await self._analyze_chapter(chapter.content)
             if not content_analysis:
                 logger.warning("No content analysis available")
                 return []
             
-            # Detect domain(s)
-            domains = self._detect_domain(chapter.content)
             logger.info(f"Detected domains: {domains}")
             
             questions = []
@@ -986,42 +1730,67 @@ class QuestionGenerator:
             if not domains:
                 # If no specific domain is detected, use generic patterns
                 logger.info("No specific domains detected, using generic patterns")
-                questions = self._generate_generic_questions(content_analysis, num_questions, chapter)
+                questions = await self._generate_generic_questions(content_analysis, num_questions, chapter)
             else:
                 # Generate domain-specific questions
                 questions_per_domain = max(1, num_questions // len(domains))
+                
+                # Rank each domain's distractors up front, off the event loop, so
+                # the generators below draw from the seeded RNG without awaiting
+                # the embedding model in between
+                await self._prefetch_term_embeddings(chapter.content, domains)
+                domain_concepts = {}
+                domain_distractors = {}
                 for domain in domains:
+                    if domain == 'language_learning':
+                        continue
                     try:
-                        if domain == 'language_learning':
-                            # Handle language learning questions asynchronously
-                            domain_questions = await self._generate_language_questions(
-                                chapter.content,
-                                content_analysis,
-                                questions_per_domain,
-                                chapter
-                            )
-                        else:
-                            # Handle other domains
-                            domain_questions = await self._generate_domain_questions(
-                                domain,
-                                chapter.content,
-                                content_analysis,
-                                questions_per_domain,
-                                chapter
-                            )
-                        
-                        if domain_questions:
-                            questions.extend(domain_questions)
-                        else:
-                            logger.warning(f"No questions generated for domain: {domain}")
+                        concepts = self._extract_domain_concepts(chapter.content, domain)
+                        domain_distractors[domain] = await self._similar_concepts(concepts, concepts[:questions_per_domain])
                     except Exception as e:
-                        logger.error(f"Error generating questions for domain {domain}: {str(e)}")
-                        continue
+                        logger.error(f"Error extracting concepts for domain {domain}: {str(e)}")
+                        concepts, domain_distractors[domain] = [], {}
+                    domain_concepts[domain] = concepts
+                
+                generators = []
+                for domain in domains:
+                    if domain == 'language_learning':
+                        # Handle language learning questions asynchronously
+                        generators.append(self._generate_language_questions(
+                            chapter.content,
+                            content_analysis,
+                            questions_per_domain,
+                            chapter
+                        ))
+                    else:
+                        # Handle other domains
+                        generators.append(self._generate_domain_questions(
+                            domain,
+                            domain_concepts[domain],
+                            domain_distractors[domain],
+                            questions_per_domain,
+                            chapter
+                        ))
+                
+                # Gather the domain generators so each fails independently and
+                # results come back in domain order. Only the language generator
+                # awaits I/O; the others are CPU-bound and run one after another
+                results = await asyncio.gather(*generators, return_exceptions=True)
+                for domain, domain_questions in zip(domains, results):
+                    if isinstance(domain_questions, BaseException):
+                        if not isinstance(domain_questions, Exception):
+                            # Cancellation and the like must propagate, not be logged
+                            raise domain_questions
+                        logger.error(f"Error generating questions for domain {domain}: {str(domain_questions)}")
+                    elif domain_questions:
+                        questions.extend(domain_questions)
+                    else:
+                        logger.warning(f"No questions generated for domain: {domain}")
             
             # If no domain-specific questions were generated, fall back to generic questions
             if not questions:
                 logger.warning("No domain-specific questions generated, falling back to generic questions")
-                questions = self._generate_generic_questions(content_analysis, num_questions, chapter)
+                questions = await self._generate_generic_questions(content_analysis, num_questions, chapter)
             
             # If still no questions, generate very basic questions from the content
             if not questions:
@@ -1029,7 +1798,7 @@ class QuestionGenerator:
                 questions = self._generate_basic_questions(chapter.content, num_questions, chapter)
             
             # Shuffle and return questions
-            random.shuffle(questions)
+            self._random.shuffle(questions)
             return questions[:num_questions]
             
         except Exception as e:
@@ -1040,11 +1809,12 @@ class QuestionGenerator:
         """Generate basic language learning questions when specific methods fail."""
         questions = []
         try:
-            # Split content into sentences
-            sentences = nltk.sent_tokenize(content)
+            # Reuse the cached sentence split and per-sentence POS tags
+            tokens = self._tokenize(content)
+            sentences = tokens['sentences']
             
-            for sentence in sentences[:count]:
-                if len(sentence.split()) < 5:  # Skip very short sentences
+            for sentence, pos_tags in zip(sentences[:count], tokens['sentence_tags']):
+                if not _has_words(sentence, 5):  # Skip very short sentences
                     continue
                 
                 # Create different types of basic language questions
@@ -1062,26 +1832,25 @@ class QuestionGenerator:
                         # For comprehension, use other sentences as options
                         options = [sentence]  # Correct answer
                         other_sentences = [s for s in sentences if s != sentence]
-                        options.extend(random.sample(other_sentences, min(3, len(other_sentences))))
+                        options.extend(self._random.sample(other_sentences, min(3, len(other_sentences))))
                     elif q_type == "grammar":
                         # For grammar, use different parts of speech as options
-                        words = nltk.word_tokenize(sentence)
-                        pos_tags = nltk.pos_tag(words)
+                        words = [word for word, _ in pos_tags]
                         nouns = [word for word, tag in pos_tags if tag.startswith('NN')]
                         if nouns:
                             options = [nouns[0]]  # Correct answer
                             other_words = [word for word in words if word not in nouns]
-                            options.extend(random.sample(other_words, min(3, len(other_words))))
+                            options.extend(self._random.sample(other_words, min(3, len(other_words))))
                     else:  # vocabulary
                         # For vocabulary, use different words as options
-                        words = nltk.word_tokenize(sentence)
+                        words = [word for word, _ in pos_tags]
                         if len(words) >= 4:
                             options = [words[0]]  # Correct answer
-                            options.extend(random.sample(words[1:], min(3, len(words) - 1)))
+                            options.extend(self._random.sample(words[1:], min(3, len(words) - 1)))
                     
                     if len(options) >= 4:
                         # Convert options to letter format
-                        letter_options = {chr(65 + i): opt for i, opt in enumerate(options)}  # A, B, C, D
+                        letter_options = dict(zip(_LETTERS, options))  # A, B, C, D
                         correct_letter = 'A'  # First option is always correct
                         
                         question = QuestionCreateSchema(
@@ -1106,11 +1875,12 @@ class QuestionGenerator:
         content_lower = content.lower()
         
         for domain, indicators in self.domain_indicators.items():
-            # Count how many indicators are present in the content
-            indicator_count = sum(1 for indicator in indicators if indicator in content_lower)
+            # Indicators present in the content, scanned lazily
+            present = (indicator for indicator in indicators if indicator in content_lower)
             
-            # If more than 2 indicators are found, consider it part of this domain
-            if indicator_count >= 2:
+            # If 2 or more indicators are found, consider it part of this domain;
+            # stop scanning the content as soon as the second one turns up
+            if next(itertools.islice(present, 1, None), None) is not None:
                 detected_domains.append(domain)
         
         return detected_domains
@@ -1119,44 +1889,29 @@ class QuestionGenerator:
         """Extract domain-specific concepts from content."""
         concepts = []
         
-        # Use NLTK for basic NLP
-        sentences = nltk.sent_tokenize(content)
+        # Use the cached NLTK sentences and tags for the content
+        tokens = self._tokenize(content)
         
-        for sentence in sentences:
-            # Extract noun phrases and key terms
-            words = nltk.word_tokenize(sentence)
-            pos_tags = nltk.pos_tag(words)
-            
-            # Extract concepts based on domain
-            if domain == 'computer_science':
-                concepts.extend(self._extract_cs_concepts(sentence, pos_tags))
-            elif domain == 'language_learning':
-                concepts.extend(self._extract_language_concepts(sentence, pos_tags))
-            elif domain == 'mathematics':
-                concepts.extend(self._extract_math_concepts(sentence, pos_tags))
-            elif domain == 'science':
-                concepts.extend(self._extract_science_concepts(sentence, pos_tags))
-            elif domain == 'history':
-                concepts.extend(self._extract_history_concepts(sentence, pos_tags))
-            elif domain == 'business':
-                concepts.extend(self._extract_business_concepts(sentence, pos_tags))
-            else:
-                # Generic concept extraction
-                concepts.extend(self._extract_generic_concepts(sentence, pos_tags))
+        # Term-list domains share one classification pass over the tokens
+        if domain in _DOMAIN_TERMS:
+            return list(self._term_concepts_by_domain(tokens).get(domain, ()))
+        
+        for sentence, pos_tags in zip(tokens['sentences'], tokens['sentence_tags']):
+            # Generic concept extraction
+            concepts.extend(self._extract_generic_concepts(sentence, pos_tags))
         
         return concepts
 
     def _extract_generic_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
         """Extract generic concepts from a sentence."""
         concepts = []
+        words = [w for w, _ in pos_tags]
         
         # Look for noun phrases and important terms
         for i, (word, tag) in enumerate(pos_tags):
             if tag.startswith(('NN', 'JJ')):  # Nouns and adjectives
-                # Get context (surrounding words)
-                start = max(0, i - 2)
-                end = min(len(pos_tags), i + 3)
-                context = ' '.join(w for w, _ in pos_tags[start:end])
+                # Get context (surrounding words) as a plain list slice
+                context = ' '.join(words[max(0, i - 2):i + 3])
                 
                 concepts.append({
                     'term': word,
@@ -1167,7 +1922,25 @@ class QuestionGenerator:
         
         return concepts
 
-    def _generate_generic_questions(self, analysis: Dict[str, Any], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
+    def _important_text_tags(self, analysis: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]]]:
+        """Join and POS-tag the analysis' important sentences once.
+
+        The tags are memoized by the joined text's digest, so later
+        generations for the same chapter reuse them.
+        """
+        text = ' '.join(analysis.get('important_sentences', []))
+        key = _content_digest(text)
+        pos_tags = self._important_tags_cache.get(key)
+        if pos_tags is not None:
+            self._important_tags_cache.move_to_end(key)
+        else:
+            pos_tags = tuple(nltk.pos_tag(nltk.word_tokenize(text)))
+            self._important_tags_cache[key] = pos_tags
+            if len(self._important_tags_cache) > _ANALYSIS_CACHE_SIZE:
+                self._important_tags_cache.popitem(last=False)
+        return text, list(pos_tags)
+
+    async def _generate_generic_questions(self, analysis: Dict[str, Any], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
         """Generate generic questions using universal patterns."""
         questions = []
         
@@ -1175,10 +1948,7 @@ class QuestionGenerator:
             logger.info("Starting generic question generation")
             
             # Extract concepts
-            concepts = self._extract_generic_concepts(
-                ' '.join(analysis.get('important_sentences', [])),
-                nltk.pos_tag(nltk.word_tokenize(' '.join(analysis.get('important_sentences', []))))
-            )
+            concepts = self._extract_generic_concepts(*self._important_text_tags(analysis))
             
             logger.info(f"Extracted {len(concepts)} concepts for generic questions")
             
@@ -1186,26 +1956,30 @@ class QuestionGenerator:
                 logger.warning("No concepts found for generic questions")
                 return []
             
-            # Generate questions for each concept
-            for concept in concepts[:count]:
+            # Occurrences of each term, to tell in O(1) whether a concept has
+            # any differently-named concept to pair with
+            term_counts = Counter(c['term'] for c in concepts)
+            
+            # Draw every question type up front, then generate a question per concept
+            selected_concepts = concepts[:count]
+            question_types = self._random.choices(_QUESTION_TYPES, k=len(selected_concepts))
+            distractors = await self._similar_concepts(concepts, selected_concepts)
+            for concept, question_type in zip(selected_concepts, question_types):
                 try:
-                    # Select question type
-                    question_type = random.choice(['concept', 'relationship', 'application'])
-                    pattern_category = random.choice(list(self.generic_domain_patterns[question_type].keys()))
+                    pattern_category = self._random.choice(_GENERIC_PATTERN_CATEGORIES[question_type])
                     
-                    logger.info(f"Generating question for concept '{concept.get('term', 'unknown')}' with type '{question_type}' and category '{pattern_category}'")
+                    logger.debug("Generating question for concept '%s' with type '%s' and category '%s'", concept.get('term', 'unknown'), question_type, pattern_category)
                     
                     # Get question pattern
-                    pattern = random.choice(self.generic_domain_patterns[question_type][pattern_category])
+                    pattern = self._random.choice(self.generic_domain_patterns[question_type][pattern_category])
                     
                     # Format question
                     if pattern_category in ['comparison', 'evaluation', 'synthesis']:
                         # Find a related concept
-                        other_concepts = [c for c in concepts if c['term'] != concept['term']]
-                        if not other_concepts:
+                        if term_counts[concept['term']] == len(concepts):
                             logger.warning(f"No related concepts found for '{concept.get('term', 'unknown')}'")
                             continue
-                        related_concept = random.choice(other_concepts)
+                        related_concept = self._choose_other_concept(concepts, concept['term'])
                         question_text = pattern.format(
                             concept1=concept['term'],
                             concept2=related_concept['term']
@@ -1214,8 +1988,8 @@ class QuestionGenerator:
                         question_text = pattern.format(concept=concept['term'])
                     
                     # Generate options
-                    options = self._generate_generic_options(concept, pattern_category, concepts)
-                    logger.info(f"Generated {len(options)} options for question")
+                    options = self._generate_generic_options(concept, pattern_category, concepts, distractors.get(concept['term']))
+                    logger.debug("Generated %d options for question", len(options))
                     
                     if len(options) >= 4:
                         question = self._create_question_schema(
@@ -1225,7 +1999,7 @@ class QuestionGenerator:
                             chapter_id=chapter.id
                         )
                         questions.append(question)
-                        logger.info(f"Successfully created question: {question_text}")
+                        logger.debug("Successfully created question: %s", question_text)
                 except Exception as e:
                     logger.error(f"Error generating generic question for concept {concept.get('term', 'unknown')}: {str(e)}", exc_info=True)
                     continue
@@ -1237,8 +2011,67 @@ class QuestionGenerator:
             logger.error(f"Error in _generate_generic_questions: {str(e)}", exc_info=True)
             return []
 
-    def _generate_generic_options(self, concept: Dict[str, Any], pattern_category: str, all_concepts: List[Dict[str, Any]]) -> List[str]:
-        """Generate generic options for questions."""
+    def _choose_other_concept(self, concepts: List[Dict[str, Any]], term: str) -> Dict[str, Any]:
+        """Pick a concept whose term differs from `term`, uniformly at random.
+
+        Uses rejection sampling instead of filtering the whole list; callers
+        must make sure at least one such concept exists.
+        """
+        while True:
+            other = self._random.choice(concepts)
+            if other['term'] != term:
+                return other
+
+    async def _prefetch_term_embeddings(self, content: str, domains: List[str]) -> None:
+        """Embed the concept terms of every detected term-list domain in one batch.
+
+        Each domain's distractors are ranked separately, but with the terms
+        already in the embedding cache none of the rankings calls the model.
+        """
+        term_domains = [domain for domain in domains if domain in _DOMAIN_TERMS]
+        if len(term_domains) < 2:
+            return
+        
+        by_domain = self._term_concepts_by_domain(self._tokenize(content))
+        terms = list(dict.fromkeys(
+            concept['term'] for domain in term_domains for concept in by_domain.get(domain, ())
+        ))
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._encode, terms)
+        except Exception as e:
+            logger.warning(f"Could not prefetch concept embeddings: {str(e)}")
+
+    async def _similar_concepts(self, concepts: List[Dict[str, Any]], selected: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Map each selected term to the three concepts with the most similar terms.
+
+        Distinct terms are embedded once and ranked with one matrix product in
+        the default executor, so loading or running the model never blocks the
+        event loop; each term stands for its first concept. Empty if embeddings
+        are unavailable. With four or fewer distinct terms the model is not
+        called at all.
+        """
+        first_by_term = {}
+        for concept in concepts:
+            first_by_term.setdefault(concept['term'], concept)
+        terms = list(first_by_term)
+        targets = list(dict.fromkeys(concept['term'] for concept in selected))
+        
+        if len(terms) <= 4:
+            # Every other term is a distractor anyway; ranking would only reorder them
+            return {
+                term: [first_by_term[other] for other in terms if other != term]
+                for term in targets
+            }
+        
+        loop = asyncio.get_running_loop()
+        similar = await loop.run_in_executor(None, self._similar_texts, terms, targets, 3)
+        return {
+            term: [first_by_term[other] for other in others]
+            for term, others in similar.items()
+        }
+
+    def _generate_generic_options(self, concept: Dict[str, Any], pattern_category: str, all_concepts: List[Dict[str, Any]], others: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """Generate generic options for questions, from `others` as distractors if given."""
         options = []
         
         # Add correct answer
@@ -1251,11 +2084,12 @@ class QuestionGenerator:
         
         options.append(correct_answer)
         
-        # Generate plausible incorrect options
-        other_concepts = [c for c in all_concepts if c['term'] != concept['term']]
+        # Generate plausible incorrect options from the most similar concepts, or
+        # else the first three other terms, stopping the scan once they are found
+        other_concepts = others or itertools.islice((c for c in all_concepts if c['term'] != concept['term']), 3)
         other_options = []
         
-        for other in other_concepts[:3]:
+        for other in other_concepts:
             if pattern_category == 'definition':
                 other_options.append(other['sentence'])
             elif pattern_category == 'application':
@@ -1266,35 +2100,39 @@ class QuestionGenerator:
         options.extend(other_options)
         return options
 
-    async def _generate_domain_questions(self, domain: str, content: str, analysis: Dict[str, Any], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
-        """Generate domain-specific questions."""
+    async def _generate_domain_questions(self, domain: str, domain_concepts: List[Dict[str, Any]], distractors: Dict[str, List[Dict[str, Any]]], count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
+        """Generate domain-specific questions from the domain's extracted concepts.
+
+        `distractors` maps the first `count` concepts' terms to their most
+        similar concepts, as ranked by _similar_concepts.
+        """
         questions = []
         
-        # Extract domain-specific concepts
-        domain_concepts = self._extract_domain_concepts(content, domain)
-        
         if not domain_concepts:
             logger.warning(f"No domain concepts found for domain: {domain}")
             return []
         
-        # Generate questions for each concept
-        for concept in domain_concepts[:count]:
+        # Occurrences of each term, to tell in O(1) whether a concept has
+        # any differently-named concept to pair with
+        term_counts = Counter(c['term'] for c in domain_concepts)
+        
+        # Draw every question type up front, then generate a question per concept
+        selected_concepts = domain_concepts[:count]
+        question_types = self._random.choices(_QUESTION_TYPES, k=len(selected_concepts))
+        for concept, question_type in zip(selected_concepts, question_types):
             try:
-                # Select question type from available types in domain_patterns
-                question_type = random.choice(['concept', 'relationship', 'application'])
-                pattern_category = random.choice(list(self.domain_patterns[question_type].keys()))
+                pattern_category = self._random.choice(_DOMAIN_PATTERN_CATEGORIES[question_type])
                 
                 # Get question pattern
-                pattern = random.choice(self.domain_patterns[question_type][pattern_category])
+                pattern = self._random.choice(self.domain_patterns[question_type][pattern_category])
                 
                 # Format question
                 if pattern_category in ['comparative', 'causal', 'hierarchical']:
                     # Find a related concept
-                    other_concepts = [c for c in domain_concepts if c['term'] != concept['term']]
-                    if not other_concepts:
+                    if term_counts[concept['term']] == len(domain_concepts):
                         # If no other concepts available, skip this pattern
                         continue
-                    related_concept = random.choice(other_concepts)
+                    related_concept = self._choose_other_concept(domain_concepts, concept['term'])
                     question_text = pattern.format(
                         concept1=concept['term'],
                         concept2=related_concept['term']
@@ -1303,7 +2141,7 @@ class QuestionGenerator:
                     question_text = pattern.format(concept=concept['term'])
                 
                 # Generate options
-                options = self._generate_domain_options(concept, pattern_category, domain_concepts)
+                options = self._generate_domain_options(concept, pattern_category, domain_concepts, distractors.get(concept['term']))
                 
                 if len(options) >= 4:
                     question = self._create_question_schema(
@@ -1319,36 +2157,27 @@ class QuestionGenerator:
         
         return questions
 
-    def _generate_domain_options(self, concept: Dict[str, Any], pattern_category: str, all_concepts: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Generate domain-specific options for questions."""
-        options = {}
-        
-        # Add correct answer
+    @staticmethod
+    def _render_domain_option(concept: Dict[str, Any], pattern_category: str) -> str:
+        """Render a concept as the option text for the given pattern category."""
         if pattern_category == 'definition':
-            correct_answer = concept['sentence']
-        elif pattern_category == 'application':
-            correct_answer = f"Using {concept['term']} in {concept['context']}"
-        else:
-            correct_answer = f"Analysis of {concept['term']} in {concept['context']}"
-        
-        options['A'] = correct_answer
-        
-        # Generate plausible incorrect options
-        other_concepts = [c for c in all_concepts if c['term'] != concept['term']]
-        other_options = []
-        
-        for other in other_concepts[:3]:
-            if pattern_category == 'definition':
-                other_options.append(other['sentence'])
-            elif pattern_category == 'application':
-                other_options.append(f"Using {other['term']} in {other['context']}")
-            else:
-                other_options.append(f"Analysis of {other['term']} in {other['context']}")
-        
-        for i, option in enumerate(other_options[:3], 1):
-            options[chr(65 + i)] = option
-        
-        return options
+            return concept['sentence']
+        if pattern_category == 'application':
+            return f"Using {concept['term']} in {concept['context']}"
+        return f"Analysis of {concept['term']} in {concept['context']}"
+
+    def _generate_domain_options(self, concept: Dict[str, Any], pattern_category: str, all_concepts: List[Dict[str, Any]], others: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """Generate domain-specific options for questions, from `others` as distractors if given.
+
+        The correct answer comes first, as _create_question_schema expects;
+        it shuffles and letters the options itself.
+        """
+        # Up to three plausible incorrect options follow the correct one;
+        # without given distractors the scan stops once three others are found
+        term = concept['term']
+        if not others:
+            others = itertools.islice((c for c in all_concepts if c['term'] != term), 3)
+        return [self._render_domain_option(c, pattern_category) for c in (concept, *others)]
 
     def _analyze_content(self, content: str) -> Dict[str, Any]:
         """Analyze the content to identify key concepts, relationships, and learning points."""
@@ -1359,9 +2188,10 @@ class QuestionGenerator:
         # Split into sections
         sections = self._split_into_sections(content)
         logger.info(f"Split content into {len(sections)} sections")
+        if settings.ANALYSIS_MAX_SECTIONS:
+            sections = sections[:settings.ANALYSIS_MAX_SECTIONS]
         
         analysis = {
-            'sections': [],
             'key_concepts': set(),
             'relationships': [],
             'examples': [],
@@ -1373,11 +2203,17 @@ class QuestionGenerator:
             'code_examples': [],  # Add code examples
             'chapter_id': None  # Add chapter_id field
         }
+        # Ordered set of important sentences across all sections
+        important_sentences = {}
+        # Normalized sentences already analysed, shared by all sections
+        seen_sentences = set()
+        # New concepts and terms contributed by the most recent sections
+        recent_growth = deque(maxlen=_ANALYSIS_PLATEAU_WINDOW)
+        found = 0
         
         for i, section in enumerate(sections, 1):
-            logger.info(f"Analyzing section {i}/{len(sections)}")
-            section_analysis = self._analyze_section(section)
-            analysis['sections'].append(section_analysis)
+            logger.debug("Analyzing section %d/%d", i, len(sections))
+            section_analysis = self._analyze_section(section, seen_sentences)
             
             # Aggregate key concepts
             analysis['key_concepts'].update(section_analysis['key_concepts'])
@@ -1389,11 +2225,12 @@ class QuestionGenerator:
             analysis['procedures'].extend(section_analysis['procedures'])
             
             # Add important sentences from this section
-            analysis['important_sentences'].extend(section_analysis['important_sentences'])
+            important_sentences.update(dict.fromkeys(section_analysis['important_sentences']))
             
-            # Identify computer science topics
+            # Identify computer science topics (topic keys are already lowercase)
+            section_lower = section.lower()
             for topic, related_topics in self.cs_topic_relationships.items():
-                if topic.lower() in section.lower():
+                if topic in section_lower:
                     analysis['cs_topics'].add(topic)
                     analysis['cs_topics'].update(related_topics)
             
@@ -1404,19 +2241,37 @@ class QuestionGenerator:
             # Extract code examples
             code_examples = self._extract_code_examples(section)
             analysis['code_examples'].extend(code_examples)
+            
+            # Stop once later sections have stopped adding concepts
+            previous, found = found, len(analysis['key_concepts']) + len(analysis['technical_terms'])
+            recent_growth.append(found - previous)
+            if i >= _ANALYSIS_MIN_SECTIONS and sum(recent_growth) < _ANALYSIS_PLATEAU_GROWTH:
+                logger.info(f"Stopping analysis after {i}/{len(sections)} sections: no new concepts")
+                break
         
+        analysis['important_sentences'] = list(important_sentences)
         return analysis
 
     def _split_into_sections(self, content: str) -> List[str]:
         """Split content into meaningful sections."""
         # Split by headers, paragraphs, or other natural breaks
-        sections = re.split(r'\n\s*\n|\n(?=\d+\.|\w+\.)', content)
-        return [s.strip() for s in sections if s.strip()]
+        if '\n' not in content:
+            section = content.strip()
+            return [section] if section else []
+        sections = map(str.strip, _SECTION_SPLIT_RE.split(content))
+        return [section for section in sections if section]
 
-    def _analyze_section(self, section: str) -> Dict[str, Any]:
-        """Analyze a section to identify its key components."""
+    def _analyze_section(self, section: str, seen: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Analyze a section to identify its key components.
+
+        `seen` holds the normalized sentences analysed so far in the chapter;
+        sentences that normalize to one of them (repeated headers and other
+        boilerplate) are skipped, and new ones are added to it.
+        """
         sentences = self._extract_sentences(section)
-        logger.info(f"Extracted {len(sentences)} sentences from section")
+        logger.debug("Extracted %d sentences from section", len(sentences))
+        if seen is None:
+            seen = set()
         
         analysis = {
             'key_concepts': set(),
@@ -1424,137 +2279,127 @@ class QuestionGenerator:
             'examples': [],
             'definitions': [],
             'procedures': [],
-            'important_sentences': []  # Add this to store important sentences
         }
+        # Ordered set, so a sentence repeated in the section is kept once
+        important_sentences = {}
         
         for sentence in sentences:
-            # Identify definitions
-            if re.search(r'\b(is|are|refers to|means|defined as|consists of|comprises|contains)\b', sentence, re.IGNORECASE):
-                analysis['definitions'].append(sentence)
-                analysis['important_sentences'].append(sentence)
+            # Skip near-duplicates: same words once case, digits and punctuation are dropped
+            sentence_lower = sentence.lower()
+            key = _SENTENCE_NOISE_RE.sub('', sentence_lower)
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            # Classify the sentence as definition/example/procedure in one scan,
+            # stopping once all three kinds have been seen
+            kinds = set()
+            for match in _SENTENCE_KIND_RE.finditer(sentence):
+                kinds.add(match.lastgroup)
+                if len(kinds) == 3:
+                    break
             
-            # Identify examples
-            if re.search(r'\b(for example|such as|like|including|e\.g\.|i\.e\.|specifically|notably)\b', sentence, re.IGNORECASE):
+            if 'definition' in kinds:
+                analysis['definitions'].append(sentence)
+            if 'example' in kinds:
                 analysis['examples'].append(sentence)
-                analysis['important_sentences'].append(sentence)
-            
-            # Identify procedures
-            if re.search(r'\b(first|then|next|finally|step|process|procedure|method|approach|technique)\b', sentence, re.IGNORECASE):
+            if 'procedure' in kinds:
                 analysis['procedures'].append(sentence)
-                analysis['important_sentences'].append(sentence)
             
             # Extract key concepts
-            concepts = self._extract_key_concepts(sentence)
+            concepts = self._extract_key_concepts(sentence, sentence_lower)
             analysis['key_concepts'].update(concepts)
             
             # Identify relationships
-            relationships = self._extract_relationships(sentence)
+            relationships = self._extract_relationships(sentence_lower)
             if relationships:
                 analysis['relationships'].extend(relationships)
-                analysis['important_sentences'].append(sentence)
             
-            # Add sentences that contain key technical terms
-            if any(concept in sentence for concept in concepts):
-                analysis['important_sentences'].append(sentence)
+            # Keep the sentence once if it is a definition, example, procedure,
+            # states a relationship or contains key technical terms
+            if kinds or relationships or any(concept in sentence for concept in concepts):
+                important_sentences[sentence] = None
         
+        analysis['important_sentences'] = list(important_sentences)
         return analysis
 
-    def _extract_key_concepts(self, sentence: str) -> List[str]:
-        """Extract key concepts from a sentence."""
-        concepts = []
+    def _extract_key_concepts(self, sentence: str, sentence_lower: Optional[str] = None) -> Set[str]:
+        """Extract the distinct key concepts of a sentence, reusing its lowercased form if given."""
+        concepts = set()
         
-        # Technical terms (words that appear in technical contexts)
-        tech_terms = re.findall(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b', sentence)
-        concepts.extend(tech_terms)
+        # Technical terms (words that appear in technical contexts); these
+        # short terms recur across sentences, so share one copy of each
+        tech_terms = _CAPITALIZED_TERM_RE.findall(sentence)
+        concepts.update(map(sys.intern, tech_terms))
         
         # Important phrases (after key indicators)
-        indicators = [
-            'called', 'known as', 'referred to as', 'defined as',
-            'consists of', 'comprises', 'contains', 'includes',
-            'is a', 'are a', 'is an', 'are an',
-            'refers to', 'means', 'represents'
-        ]
-        
+        if sentence_lower is None:
+            sentence_lower = sentence.lower()
+        # One scan for any indicator first; most sentences hold none
+        indicators = _CONCEPT_INDICATORS if _CONCEPT_INDICATOR_ANY_RE.search(sentence_lower) else ()
         for indicator in indicators:
-            if indicator in sentence.lower():
-                # Extract the phrase after the indicator
-                parts = sentence.lower().split(indicator)
-                if len(parts) > 1:
-                    phrase = parts[1].split('.')[0].strip()
-                    if len(phrase.split()) <= 5:  # Limit phrase length
-                        concepts.append(phrase)
-        
-        # Add any technical terms found in the sentence
-        technical_terms = [
-            'function', 'method', 'class', 'object', 'variable',
-            'parameter', 'argument', 'return', 'type', 'interface',
-            'module', 'package', 'library', 'framework', 'algorithm',
-            'data structure', 'database', 'query', 'index', 'key',
-            'value', 'array', 'list', 'dictionary', 'map', 'set',
-            'tree', 'graph', 'node', 'edge', 'vertex', 'path'
-        ]
-        
-        for term in technical_terms:
-            if term in sentence.lower():
-                concepts.append(term)
+            pos = sentence_lower.find(indicator)
+            if pos < 0:
+                continue
+            # The phrase runs from the indicator to the next period or the
+            # indicator's next occurrence, sliced without splitting the sentence
+            start = pos + len(indicator)
+            end = len(sentence_lower)
+            for stop in (sentence_lower.find('.', start), sentence_lower.find(indicator, start)):
+                if 0 <= stop < end:
+                    end = stop
+            phrase = sentence_lower[start:end].strip()
+            if not _has_words(phrase, 6):  # Limit phrase length
+                concepts.add(phrase)
+        
+        # Add any technical terms found in the sentence as whole words, singular or plural
+        concepts.update(_KEY_TECHNICAL_TERM_FORMS[form] for form in _KEY_TECHNICAL_TERM_RE.findall(sentence_lower))
         
-        return list(set(concepts))  # Remove duplicates
+        return concepts
 
-    def _extract_relationships(self, sentence: str) -> List[Tuple[str, str, str]]:
-        """Extract relationships between concepts."""
+    def _extract_relationships(self, sentence_lower: str) -> List[Tuple[str, str, str]]:
+        """Extract relationships between concepts from an already lowercased sentence."""
+        # Most sentences hold no indicator at all
+        if not _RELATIONSHIP_ANY_RE.search(sentence_lower):
+            return []
+        
         relationships = []
         
         # Look for relationship indicators
-        indicators = {
-            'is_a': ['is a', 'are a', 'is an', 'are an'],
-            'has_a': ['has a', 'have a', 'contains', 'includes'],
-            'can': ['can', 'could', 'may', 'might'],
-            'requires': ['requires', 'needs', 'must have'],
-            'leads_to': ['leads to', 'results in', 'causes', 'creates']
-        }
-        
-        for rel_type, rel_indicators in indicators.items():
+        for rel_type, rel_indicators in _RELATIONSHIP_INDICATORS.items():
             for indicator in rel_indicators:
-                if indicator in sentence.lower():
-                    # Extract the concepts before and after the indicator
-                    parts = sentence.lower().split(indicator)
-                    if len(parts) > 1:
-                        concept1 = parts[0].split()[-1]  # Last word before indicator
-                        concept2 = parts[1].split('.')[0].strip().split()[0]  # First word after indicator
+                # Extract the concepts before and after the indicator in one scan
+                parts = sentence_lower.split(indicator, 2)
+                if len(parts) > 1:
+                    # Only the words next to the indicator are needed, so bound the splits
+                    words_before = parts[0].rsplit(None, 1)
+                    words_after = parts[1].split('.', 1)[0].split(None, 1)
+                    # Skip indicators at the very start or end of the sentence
+                    if words_before and words_after:
+                        concept1 = words_before[-1]  # Last word before indicator
+                        concept2 = words_after[0]  # First word after indicator
                         relationships.append((concept1, rel_type, concept2))
         
         return relationships
 
     def _extract_technical_terms(self, text: str) -> List[str]:
         """Extract technical terms specific to computer science."""
-        technical_terms = []
-        
-        # Common technical term patterns
-        patterns = [
-            r'\b(?:O\([^)]+\)|Big O|time complexity|space complexity)\b',
-            r'\b(?:algorithm|data structure|design pattern|framework|library)\b',
-            r'\b(?:inheritance|polymorphism|encapsulation|abstraction)\b',
-            r'\b(?:database|query|index|transaction|normalization)\b',
-            r'\b(?:protocol|routing|security|encryption|authentication)\b',
-            r'\b(?:process|thread|memory|scheduling|synchronization)\b'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            technical_terms.extend(match.group() for match in matches)
-        
-        return list(set(technical_terms))
+        return list({sys.intern(match.group()) for match in _TECHNICAL_TERM_RE.finditer(text)})
 
     def _extract_code_examples(self, text: str) -> List[str]:
         """Extract code examples from the text."""
+        # Both code forms are delimited by backticks, which most sections lack
+        if '`' not in text:
+            return []
+        
         code_examples = []
         
         # Look for code blocks
-        code_blocks = re.finditer(r'```(?:\w+)?\n(.*?)\n```', text, re.DOTALL)
+        code_blocks = _CODE_BLOCK_RE.finditer(text)
         code_examples.extend(block.group(1) for block in code_blocks)
         
         # Look for inline code
-        inline_code = re.finditer(r'`([^`]+)`', text)
+        inline_code = _INLINE_CODE_RE.finditer(text)
         code_examples.extend(code.group(1) for code in inline_code)
         
         return code_examples
@@ -1562,32 +2407,21 @@ class QuestionGenerator:
     def _determine_difficulty(self, question_text: str, pattern_type: str) -> str:
         """Determine question difficulty based on content and pattern type."""
         # Check for difficulty indicators in the question text
-        for difficulty, indicators in self.difficulty_indicators.items():
-            if any(keyword in question_text.lower() for keyword in indicators['keywords']):
+        for difficulty, keyword_re in _DIFFICULTY_KEYWORD_RES:
+            if keyword_re.search(question_text):
                 return difficulty
         
         # Default difficulty based on pattern type
-        difficulty_map = {
-            'definition': 'easy',
-            'application': 'medium',
-            'analysis': 'hard'
-        }
-        return difficulty_map.get(pattern_type, 'medium')
+        return _PATTERN_DIFFICULTY.get(pattern_type, 'medium')
 
     def _extract_sentences(self, text: str) -> List[str]:
         """Extract sentences from text using NLTK."""
         try:
-            # Download required NLTK data if not already downloaded
-            try:
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                nltk.download('punkt')
-            
-            # Split text into sentences
-            sentences = nltk.sent_tokenize(text)
+            # Split text into sentences (punkt is ensured once in __init__)
+            sentences = _sent_tokenize(text)
             
             # Filter out very short sentences (likely not meaningful)
-            sentences = [s.strip() for s in sentences if len(s.split()) > 3]
+            sentences = [s.strip() for s in sentences if _has_words(s, 4)]
             
             return sentences
         except Exception as e:
@@ -1595,11 +2429,12 @@ class QuestionGenerator:
             # Fallback to simple sentence splitting if NLTK fails
             return [s.strip() for s in text.split('.') if s.strip()]
 
-    def _extract_main_idea(self, text: str) -> str:
+    def _extract_main_idea(self, text: str, sentences: Optional[List[str]] = None) -> str:
         """Extract the main idea from a paragraph using NLP techniques."""
         try:
-            # Split into sentences
-            sentences = nltk.sent_tokenize(text)
+            # Split into sentences unless the caller already did
+            if sentences is None:
+                sentences = _sent_tokenize(text)
             if not sentences:
                 return text[:100] + "..."  # Return first 100 chars if no sentences found
             
@@ -1607,11 +2442,11 @@ class QuestionGenerator:
             main_idea = sentences[0]
             
             # If the first sentence is too short, look for a more substantial one
-            if len(main_idea.split()) < 5:
-                for sentence in sentences[1:]:
-                    if len(sentence.split()) >= 5:
-                        main_idea = sentence
-                        break
+            if not _has_words(main_idea, 5):
+                main_idea = next(
+                    (sentence for sentence in sentences[1:] if _has_words(sentence, 5)),
+                    main_idea
+                )
             
             return main_idea
             
@@ -1620,30 +2455,23 @@ class QuestionGenerator:
             # Fallback: return the first 100 characters
             return text[:100] + "..."
 
-    def _extract_key_points(self, text: str) -> List[str]:
+    def _extract_key_points(self, text: str, sentences: Optional[List[str]] = None) -> List[str]:
         """Extract key points from a paragraph."""
         try:
-            # Split into sentences
-            sentences = nltk.sent_tokenize(text)
-            key_points = []
-            
-            # Look for sentences that contain key indicators
-            indicators = [
-                'important', 'key', 'main', 'primary', 'significant',
-                'notable', 'crucial', 'essential', 'fundamental'
+            # Split into sentences unless the caller already did
+            if sentences is None:
+                sentences = _sent_tokenize(text)
+            # Keep sentences that contain key indicators, plus those that are
+            # likely to be key points on length alone
+            key_points = [
+                sentence for sentence in sentences
+                if _KEY_POINT_RE.search(sentence)
+                or (_has_words(sentence, 8) and not sentence.startswith(_CONJUNCTION_STARTS))
             ]
             
-            for sentence in sentences:
-                # Check if sentence contains any indicators
-                if any(indicator in sentence.lower() for indicator in indicators):
-                    key_points.append(sentence)
-                # Also include sentences that are likely to be key points
-                elif len(sentence.split()) >= 8 and not sentence.startswith(('And', 'But', 'Or', 'So')):
-                    key_points.append(sentence)
-            
             # If no key points found, use the first two substantial sentences
             if not key_points and len(sentences) >= 2:
-                key_points = [s for s in sentences[:2] if len(s.split()) >= 5]
+                key_points = [s for s in sentences[:2] if _has_words(s, 5)]
             
             return key_points
             
@@ -1651,142 +2479,25 @@ class QuestionGenerator:
             logger.error(f"Error extracting key points: {str(e)}")
             return []
 
-    def _extract_cs_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract computer science concepts from a sentence."""
-        concepts = []
-        
-        # Computer science specific terms and patterns
-        cs_terms = [
-            'algorithm', 'data structure', 'programming', 'software',
-            'database', 'network', 'security', 'web development',
-            'function', 'class', 'object', 'variable', 'method',
-            'interface', 'module', 'package', 'library', 'framework'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in cs_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'computer_science'
-                })
-        
-        return concepts
-
-    def _extract_language_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract language learning concepts from a sentence."""
-        concepts = []
-        
-        # Language learning specific terms
-        language_terms = [
-            'vocabulary', 'grammar', 'reading', 'writing',
-            'pronunciation', 'speaking', 'listening', 'sentence',
-            'word', 'phrase', 'tense', 'verb', 'noun', 'adjective'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in language_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'language_learning'
-                })
-        
-        return concepts
-
-    def _extract_math_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract mathematics concepts from a sentence."""
-        concepts = []
-        
-        # Mathematics specific terms
-        math_terms = [
-            'algebra', 'calculus', 'geometry', 'statistics',
-            'equation', 'function', 'theorem', 'proof',
-            'number', 'formula', 'variable', 'constant',
-            'derivative', 'integral', 'matrix', 'vector'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in math_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'mathematics'
-                })
-        
-        return concepts
-
-    def _extract_science_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract science concepts from a sentence."""
-        concepts = []
-        
-        # Science specific terms
-        science_terms = [
-            'physics', 'chemistry', 'biology', 'experiment',
-            'theory', 'hypothesis', 'research', 'analysis',
-            'molecule', 'atom', 'cell', 'organism',
-            'reaction', 'force', 'energy', 'matter'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in science_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'science'
-                })
-        
-        return concepts
-
-    def _extract_history_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract history concepts from a sentence."""
-        concepts = []
-        
-        # History specific terms
-        history_terms = [
-            'period', 'era', 'century', 'event',
-            'civilization', 'culture', 'war', 'revolution',
-            'dynasty', 'empire', 'kingdom', 'republic',
-            'treaty', 'battle', 'conquest', 'independence'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in history_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'history'
-                })
-        
-        return concepts
+    def _term_concepts_by_domain(self, tokens: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group the tokens matching a domain term list by domain, in one pass.
 
-    def _extract_business_concepts(self, sentence: str, pos_tags: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
-        """Extract business concepts from a sentence."""
-        concepts = []
-        
-        # Business specific terms
-        business_terms = [
-            'management', 'marketing', 'finance', 'economics',
-            'strategy', 'organization', 'leadership', 'entrepreneurship',
-            'market', 'product', 'service', 'customer',
-            'investment', 'profit', 'revenue', 'business'
-        ]
-        
-        for word, tag in pos_tags:
-            if word.lower() in business_terms:
-                concepts.append({
-                    'term': word,
-                    'type': tag,
-                    'context': sentence,
-                    'domain': 'business'
-                })
-        
-        return concepts
+        The result is memoized on the cached tokens, so every domain detected
+        for the same content reuses it.
+        """
+        if 'term_concepts' not in tokens:
+            by_domain = {}
+            for sentence, pos_tags in zip(tokens['sentences'], tokens['sentence_tags']):
+                for word, tag in pos_tags:
+                    for domain in _TERM_DOMAINS.get(word.lower(), ()):
+                        by_domain.setdefault(domain, []).append({
+                            'term': word,
+                            'type': tag,
+                            'context': sentence,
+                            'domain': domain
+                        })
+            tokens['term_concepts'] = by_domain
+        return tokens['term_concepts']
 
     def _generate_basic_questions(self, content: str, count: int, chapter: Chapter) -> List[QuestionCreateSchema]:
         """Generate basic questions from content when other methods fail."""
@@ -1795,12 +2506,18 @@ class QuestionGenerator:
             logger.info("Starting basic question generation")
             
             # Split content into sentences
-            sentences = nltk.sent_tokenize(content)
+            sentences = _sent_tokenize(content)
             logger.info(f"Split content into {len(sentences)} sentences")
             
+            # Distractors are drawn by index from the distinct sentences, so no
+            # per-question list of the other sentences has to be built
+            distinct = list(dict.fromkeys(sentences))
+            positions = {s: i for i, s in enumerate(distinct)}
+            k = min(3, len(distinct) - 1)
+            
             # Generate questions for each sentence
             for sentence in sentences[:count]:
-                if len(sentence.split()) < 5:  # Skip very short sentences
+                if not _has_words(sentence, 5):  # Skip very short sentences
                     continue
                 
                 # Create a simple question
@@ -1809,9 +2526,12 @@ class QuestionGenerator:
                 # Generate options
                 options = [sentence]  # Correct answer
                 
-                # Add other sentences as options
-                other_sentences = [s for s in sentences if s != sentence]
-                options.extend(random.sample(other_sentences, min(3, len(other_sentences))))
+                # Add other sentences as options, skipping this one's position
+                pos = positions[sentence]
+                options.extend(
+                    distinct[j if j < pos else j + 1]
+                    for j in self._random.sample(range(len(distinct) - 1), k)
+                )
                 
                 if len(options) >= 4:
                     try:
@@ -1822,7 +2542,7 @@ class QuestionGenerator:
                             chapter_id=chapter.id
                         )
                         questions.append(question)
-                        logger.info(f"Successfully created basic question: {question_text}")
+                        logger.debug("Successfully created basic question: %s", question_text)
                     except Exception as e:
                         logger.error(f"Error creating question schema: {str(e)}", exc_info=True)
                         continue
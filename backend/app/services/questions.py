@@ -1,61 +1,262 @@
+import asyncio
+import functools
+import orjson
 import logging
-from typing import List, Dict, Any
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Tuple, TypeVar
 from app.core.config import settings
-import openai
+import httpx
+from openai import AsyncOpenAI
 from app.models.question import Question as QuestionModel
 from app.models.chapter import Chapter as ChapterModel
-from sqlalchemy.orm import Session
-from app.services.llm import generate_questions as generate_with_existing_model
+from app.models.upload import Upload as UploadModel
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only
+from app.core.db import SessionLocal
+from app.schemas import GeneratedQuestionsSchema
+from app.services.question_generator import QuestionGenerator, _content_digest
 
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI
-openai.api_key = settings.OPENAI_API_KEY
+# Upper bound on pooled HTTP connections to the OpenAI API
+_MAX_OPENAI_CONNECTIONS = 64
+
+# OpenAI client shared by all requests, so keep-alive connections and TLS
+# sessions are reused instead of set up per completion; created on first use
+_client: Optional[AsyncOpenAI] = None
+
+def _get_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=_MAX_OPENAI_CONNECTIONS))
+        )
+    return _client
+
+async def aclose() -> None:
+    """Close the shared OpenAI client and its HTTP connections. Called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = None
+
+# Upper bound on chat completions in flight during a bulk generation
+_MAX_CONCURRENT_COMPLETIONS = 16
+
+# Bump whenever the question prompt changes, so cached responses are not reused
+_PROMPT_VERSION = 4
+
+# Static instructions, sent as an identical system message on every call so
+# the provider's prompt cache can reuse the prefill for this prefix; only the
+# user message varies between chapters
+_QUESTION_SYSTEM_PROMPT = (
+    "You are a helpful assistant that generates educational multiple choice questions. "
+    "Each question should have 4 options (A, B, C, D) and one correct answer. "
+    "For each question give the question text, the four options, the letter of "
+    "the correct option (A, B, C, or D), a brief explanation of why it is correct, "
+    "and its difficulty (easy, medium, or hard)."
+)
+
+# Structured output the completion is constrained to: {"questions": [...]}
+_QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "questions",
+        "strict": True,
+        "schema": GeneratedQuestionsSchema.model_json_schema()
+    }
+}
+
+# Maximum number of OpenAI responses kept in memory
+_OPENAI_CACHE_SIZE = 256
+
+# Parsed questions per (content digest, num_questions, prompt version) (LRU)
+_openai_cache: "OrderedDict[Tuple[bytes, int, int], Tuple[Dict[str, Any], ...]]" = OrderedDict()
+
+class _QuestionObjectScanner:
+    """Pull complete JSON objects nested at object_depth out of a streamed document.
+
+    Tracks brace depth outside of string literals, so each question object
+    can be parsed as soon as its closing brace arrives.
+    """
+
+    def __init__(self, object_depth: int = 0):
+        self.object_depth = object_depth
+        self.buffer = ""
+        self.position = 0
+        self.depth = 0
+        self.start = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        self.buffer += text
+        objects = []
+        for index in range(self.position, len(self.buffer)):
+            char = self.buffer[index]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                if self.depth == self.object_depth:
+                    self.start = index
+                self.depth += 1
+            elif char == '}' and self.depth > 0:
+                self.depth -= 1
+                if self.depth == self.object_depth:
+                    objects.append(orjson.loads(self.buffer[self.start:index + 1]))
+        self.position = len(self.buffer)
+        # Drop consumed text once no object is open
+        if self.depth <= self.object_depth:
+            self.buffer = ""
+            self.position = 0
+        return objects
+
+async def stream_questions_with_openai(chapter_text: str, num_questions: int = 5) -> AsyncIterator[Dict[str, Any]]:
+    """Stream questions from OpenAI's API, yielding each one as soon as it is complete"""
+    key = (_content_digest(chapter_text), num_questions, _PROMPT_VERSION)
+    cached = _openai_cache.get(key)
+    if cached is not None:
+        _openai_cache.move_to_end(key)
+        logger.info(f"Using cached OpenAI questions for {num_questions} questions")
+        for question in cached:
+            yield dict(question)
+        return
+
+    logger.info(f"Generating {num_questions} questions using OpenAI")
+
+    prompt = f"Generate {num_questions} multiple choice questions based on the following text.\n\n{chapter_text}"
+
+    # The JSON schema guarantees parseable output, so no parse-failure retries
+    response = await _get_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": _QUESTION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=2000,
+        response_format=_QUESTIONS_RESPONSE_FORMAT,
+        stream=True
+    )
+
+    # Parse question objects out of the "questions" array as its tokens arrive
+    scanner = _QuestionObjectScanner(object_depth=1)
+    questions = []
+    async for chunk in response:
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        if content:
+            for question in scanner.feed(content):
+                questions.append(dict(question))
+                yield question
+
+    # Only a fully streamed response is cached
+    _openai_cache[key] = tuple(questions)
+    if len(_openai_cache) > _OPENAI_CACHE_SIZE:
+        _openai_cache.popitem(last=False)
+    logger.info("Successfully generated questions with OpenAI")
 
 async def generate_questions_with_openai(chapter_text: str, num_questions: int = 5) -> List[Dict[str, Any]]:
     """Generate questions using OpenAI's API"""
     try:
-        logger.info(f"Generating {num_questions} questions using OpenAI")
-        
-        prompt = f"""Generate {num_questions} multiple choice questions based on the following text. 
-        Each question should have 4 options (A, B, C, D) and one correct answer.
-        Format each question as a JSON object with the following structure:
-        {{
-            "question": "The question text",
-            "options": ["Option A", "Option B", "Option C", "Option D"],
-            "correct_answer": "The correct option (A, B, C, or D)",
-            "explanation": "Brief explanation of why this is the correct answer"
-        }}
-
-        Text to generate questions from:
-        {chapter_text}
-
-        Return only the JSON array of questions, nothing else."""
-
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that generates educational multiple choice questions."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
-        )
-
-        # Extract the questions from the response
-        questions_text = response.choices[0].message.content
-        logger.info("Successfully generated questions with OpenAI")
-        
-        # Parse the questions (you might need to add error handling here)
-        import json
-        questions = json.loads(questions_text)
-        
-        return questions
+        return [question async for question in stream_questions_with_openai(chapter_text, num_questions)]
 
     except Exception as e:
         logger.error(f"Error generating questions with OpenAI: {str(e)}")
         raise
 
+def _question_mapping(chapter_id: int, q_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an OpenAI question dict onto question table columns"""
+    return {
+        "chapter_id": chapter_id,
+        "question_text": q_data['question'],
+        "question_type": "multiple_choice",
+        "options": q_data['options'],
+        "correct_answer": q_data['correct_answer'],
+        "difficulty": q_data['difficulty'],
+        "explanation": q_data.get('explanation', '')
+    }
+
+async def generate_with_existing_model(chapter: ChapterModel, num_questions: int = 5) -> List[Dict[str, Any]]:
+    """Generate questions with the domain-based QuestionGenerator, as question table mappings"""
+    questions = await QuestionGenerator().generate_questions(chapter, num_questions)
+    return [question.model_dump() for question in questions]
+
+async def generate_questions_bulk(
+    chapters: List[ChapterModel],
+    num_questions: int = 5,
+    use_openai: bool = True
+) -> List[List[Dict[str, Any]]]:
+    """Generate question table mappings for several chapters concurrently.
+
+    Requests run in parallel, at most _MAX_CONCURRENT_COMPLETIONS at a time,
+    so a multi-chapter upload waits roughly one round trip instead of one per
+    chapter. Results are returned in the order of chapters.
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_COMPLETIONS)
+
+    async def generate_one(chapter: ChapterModel) -> List[Dict[str, Any]]:
+        async with semaphore:
+            if use_openai:
+                questions_data = await generate_questions_with_openai(chapter.content, num_questions)
+                return [_question_mapping(chapter.id, q_data) for q_data in questions_data]
+            return await generate_with_existing_model(chapter, num_questions)
+
+    logger.info(f"Generating questions for {len(chapters)} chapters")
+    return await asyncio.gather(*(generate_one(chapter) for chapter in chapters))
+
+def _insert_questions(db: Session, mappings: List[Dict[str, Any]]) -> List[QuestionModel]:
+    """Insert question rows in one multi-row statement, returning them as ORM objects"""
+    if not mappings:
+        return []
+    statement = insert(QuestionModel).returning(QuestionModel, sort_by_parameter_order=True)
+    return list(db.scalars(statement, mappings))
+
+def _save_questions(db: Session, mappings: List[Dict[str, Any]]) -> List[QuestionModel]:
+    """Insert question rows and commit, returning them in mapping order"""
+    questions = _insert_questions(db, mappings)
+    db.commit()
+    return questions
+
+def _mark_chapters_generated(db: Session, chapter_ids: List[int]) -> Dict[int, List[int]]:
+    """Set has_questions on chapters and commit, returning their ids per upload"""
+    upload_chapters: Dict[int, List[int]] = {}
+    for chapter in db.query(ChapterModel).options(load_only(ChapterModel.upload_id))\
+            .filter(ChapterModel.id.in_(chapter_ids)):
+        chapter.has_questions = True
+        upload_chapters.setdefault(chapter.upload_id, []).append(chapter.id)
+    db.commit()
+    return upload_chapters
+
+def _append_upload_log(db: Session, upload_ids: List[int], message: str) -> None:
+    """Append a timestamped line to each upload's processing logs and commit"""
+    log_message = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {message}"
+    for upload in db.query(UploadModel).filter(UploadModel.id.in_(upload_ids)):
+        upload.processing_logs = f"{upload.processing_logs}\n{log_message}" if upload.processing_logs else log_message
+    db.commit()
+
+_T = TypeVar("_T")
+
+async def _run_db(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run a blocking Session call in the default executor.
+
+    The session is synchronous (psycopg2); running its round trips in a
+    thread keeps the event loop free for the concurrent LLM requests. Calls
+    are awaited one at a time, so the session is never used by two threads
+    at once.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
 async def generate_questions(
     chapter_id: int,
     db: Session,
@@ -65,36 +266,103 @@ async def generate_questions(
     """Generate questions for a chapter using either the existing model or OpenAI"""
     try:
         # Get the chapter
-        chapter = db.query(ChapterModel).filter(ChapterModel.id == chapter_id).first()
+        chapter = await _run_db(
+            db.get, ChapterModel, chapter_id,
+            options=[load_only(ChapterModel.content)]
+        )
         if not chapter:
             raise ValueError(f"Chapter {chapter_id} not found")
 
         logger.info(f"Generating questions for chapter {chapter_id} using {'OpenAI' if use_openai else 'existing model'}")
 
-        # Generate questions using the selected method
+        # Create question records
         if use_openai:
-            questions_data = await generate_questions_with_openai(chapter.content, num_questions)
+            # Parse each question as soon as it has streamed in; they are
+            # all inserted together once the stream ends
+            mappings = [
+                _question_mapping(chapter_id, q_data)
+                async for q_data in stream_questions_with_openai(chapter.content, num_questions)
+            ]
         else:
-            questions_data = await generate_with_existing_model(chapter.content, num_questions)
+            mappings = await generate_with_existing_model(chapter, num_questions)
 
-        # Create question records
-        questions = []
-        for q_data in questions_data:
-            question = QuestionModel(
-                chapter_id=chapter_id,
-                question_text=q_data['question'],
-                options=q_data['options'],
-                correct_answer=q_data['correct_answer'],
-                explanation=q_data.get('explanation', '')
-            )
-            db.add(question)
-            questions.append(question)
-
-        db.commit()
+        questions = await _run_db(_save_questions, db, mappings)
         logger.info(f"Successfully generated and saved {len(questions)} questions")
         return questions
 
     except Exception as e:
         logger.error(f"Error generating questions: {str(e)}")
         db.rollback()
-        raise 
\ No newline at end of file
+        raise 
+
+async def generate_questions_for_chapters(
+    chapter_ids: List[int],
+    db: Session,
+    use_openai: bool = False,
+    num_questions: int = 5
+) -> Dict[int, List[QuestionModel]]:
+    """Generate questions for several chapters with one bulk generation and one commit"""
+    try:
+        query = db.query(ChapterModel).options(load_only(ChapterModel.content, ChapterModel.upload_id))\
+            .filter(ChapterModel.id.in_(chapter_ids))
+        chapters = await _run_db(query.all)
+        found = {chapter.id for chapter in chapters}
+        missing = [chapter_id for chapter_id in chapter_ids if chapter_id not in found]
+        if missing:
+            raise ValueError(f"Chapters {missing} not found")
+
+        logger.info(f"Generating questions for {len(chapters)} chapters using {'OpenAI' if use_openai else 'existing model'}")
+
+        results = await generate_questions_bulk(chapters, num_questions, use_openai)
+
+        # Create question records for every chapter in one insert
+        mappings = [mapping for chapter_mappings in results for mapping in chapter_mappings]
+        questions_by_chapter = {chapter.id: [] for chapter in chapters}
+        questions = await _run_db(_save_questions, db, mappings)
+        for mapping, question in zip(mappings, questions):
+            questions_by_chapter[mapping["chapter_id"]].append(question)
+
+        logger.info(f"Successfully generated and saved questions for {len(chapters)} chapters")
+        return questions_by_chapter
+
+    except Exception as e:
+        logger.error(f"Error generating questions: {str(e)}")
+        db.rollback()
+        raise
+
+async def generate_questions_job(
+    chapter_ids: List[int],
+    use_openai: bool = True,
+    num_questions: int = 5
+) -> None:
+    """Background job: generate and save questions for chapters off the request path.
+
+    Runs after the response has been sent, with its own DB session. Progress
+    and failures are appended to each affected upload's processing logs,
+    which GET /api/uploads/{upload_id}/status returns, and generated chapters
+    are marked has_questions.
+    """
+    db = SessionLocal()
+    upload_ids: List[int] = []
+    try:
+        query = db.query(ChapterModel.upload_id).filter(ChapterModel.id.in_(chapter_ids)).distinct()
+        upload_ids = [upload_id for upload_id, in await _run_db(query.all)]
+        await _run_db(_append_upload_log, db, upload_ids, f"Generating questions for chapters {chapter_ids}")
+
+        questions_by_chapter = await generate_questions_for_chapters(chapter_ids, db, use_openai, num_questions)
+
+        upload_chapters = await _run_db(_mark_chapters_generated, db, chapter_ids)
+
+        for upload_id, ids in upload_chapters.items():
+            total = sum(len(questions_by_chapter[chapter_id]) for chapter_id in ids)
+            await _run_db(_append_upload_log, db, [upload_id], f"Generated {total} questions for chapters {ids}")
+
+    except Exception as e:
+        logger.error(f"Error in question generation job for chapters {chapter_ids}: {str(e)}")
+        try:
+            db.rollback()
+            await _run_db(_append_upload_log, db, upload_ids, f"Error generating questions for chapters {chapter_ids}: {str(e)}")
+        except Exception as log_error:
+            logger.error(f"Error recording question generation failure: {str(log_error)}")
+    finally:
+        db.close()
@@ -1,13 +0,0 @@
-from typing import List, Dict
-import json
-
-def generate_quiz(chapter_summary: str) -> List[Dict]:
-    # Placeholder for actual quiz generation logic (e.g., using LangChain or LLM)
-    return [
-        {
-            "question": "Sample question?",
-            "choices": ["A", "B", "C", "D"],
-            "answer": 2,
-            "explanation": "Sample explanation"
-        }
-    ] 
\ No newline at end of file
@@ -1,8 +1,62 @@
+from collections import OrderedDict
 from keybert import KeyBERT
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from app.services.question_generator import _content_digest, _get_embedding_model
 
-kw_model = KeyBERT("all-MiniLM-L6-v2")
+# Maximum number of (text, top_n) keyword results kept in memory
+_TAG_CACHE_SIZE = 4096
+
+# Built on first use around the shared (quantized) MiniLM embedding model
+kw_model: Optional[KeyBERT] = None
+
+# Keywords per (content digest, top_n) (LRU); KeyBERT is deterministic
+_tag_cache: "OrderedDict[Tuple[bytes, int], Tuple[str, ...]]" = OrderedDict()
+
+def _get_kw_model() -> KeyBERT:
+    global kw_model
+    if kw_model is None:
+        kw_model = KeyBERT(model=_get_embedding_model())
+    return kw_model
+
+def _cache_tags(key: Tuple[bytes, int], tags: Tuple[str, ...]) -> None:
+    _tag_cache[key] = tags
+    if len(_tag_cache) > _TAG_CACHE_SIZE:
+        _tag_cache.popitem(last=False)
 
 def extract_tags(text: str, top_n: int = 8) -> List[str]:
-    keywords = kw_model.extract_keywords(text, top_n=top_n)
-    return [k for k, _ in keywords] 
\ No newline at end of file
+    key = (_content_digest(text), top_n)
+    tags = _tag_cache.get(key)
+    if tags is not None:
+        _tag_cache.move_to_end(key)
+        return list(tags)
+
+    keywords = _get_kw_model().extract_keywords(text, top_n=top_n)
+    tags = tuple(k for k, _ in keywords)
+    _cache_tags(key, tags)
+    return list(tags)
+
+def extract_tags_batch(texts: List[str], top_n: int = 8) -> List[List[str]]:
+    """Tags for several texts, encoding all uncached ones in one KeyBERT call."""
+    keys = [(_content_digest(text), top_n) for text in texts]
+    found: Dict[Tuple[bytes, int], Tuple[str, ...]] = {}
+    missing: Dict[Tuple[bytes, int], str] = {}
+    for key, text in zip(keys, texts):
+        tags = _tag_cache.get(key)
+        if tags is not None:
+            _tag_cache.move_to_end(key)
+            found[key] = tags
+        elif key not in missing:
+            missing[key] = text
+
+    if len(missing) == 1:
+        # KeyBERT returns a flat keyword list for a single document
+        (key, text), = missing.items()
+        found[key] = tuple(extract_tags(text, top_n))
+    elif missing:
+        # One call returns a keyword list per document, in input order
+        results = _get_kw_model().extract_keywords(list(missing.values()), top_n=top_n)
+        for key, keywords in zip(missing, results):
+            found[key] = tuple(k for k, _ in keywords)
+            _cache_tags(key, found[key])
+
+    return [list(found[key]) for key in keys]
@@ -1,5 +1,5 @@
 from fastapi import WebSocket
-from typing import Dict, List
+from typing import Dict, Set
 import json
 import logging
 
@@ -7,21 +7,21 @@ logger = logging.getLogger(__name__)
 
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.active_connections: Dict[int, Set[WebSocket]] = {}
         logger.info("ConnectionManager initialized")
 
     async def connect(self, websocket: WebSocket, upload_id: int):
         logger.info(f"Attempting to accept WebSocket connection for upload {upload_id}")
         await websocket.accept()
-        if upload_id not in self.active_connections:
-            self.active_connections[upload_id] = []
-        self.active_connections[upload_id].append(websocket)
+        self.active_connections.setdefault(upload_id, set()).add(websocket)
         logger.info(f"WebSocket connected successfully for upload {upload_id}. Active connections: {len(self.active_connections[upload_id])}")
 
     def disconnect(self, websocket: WebSocket, upload_id: int):
-        if upload_id in self.active_connections:
-            self.active_connections[upload_id].remove(websocket)
-            if not self.active_connections[upload_id]:
+        connections = self.active_connections.get(upload_id)
+        # The socket may already be gone if a send to it failed meanwhile
+        if connections is not None and websocket in connections:
+            connections.discard(websocket)
+            if not connections:
                 del self.active_connections[upload_id]
             logger.info(f"WebSocket disconnected for upload {upload_id}. Remaining connections: {len(self.active_connections.get(upload_id, []))}")
 
@@ -29,7 +29,8 @@ class ConnectionManager:
         if upload_id in self.active_connections:
             message = json.dumps({"logs": logs}) if isinstance(logs, str) else logs
             logger.debug(f"Sending logs to upload {upload_id}: {message[:100]}...")  # Log first 100 chars
-            for connection in self.active_connections[upload_id]:
+            # Iterate over a copy, as failed connections are removed from the set
+            for connection in list(self.active_connections[upload_id]):
                 try:
                     await connection.send_text(message)
                     logger.debug(f"Successfully sent logs to connection for upload {upload_id}")
@@ -48,7 +49,7 @@ class ConnectionManager:
                     logger.info(f"Closed WebSocket connection for upload {upload_id}")
                 except Exception as e:
                     logger.error(f"Error closing WebSocket connection for upload {upload_id}: {str(e)}")
-            self.active_connections[upload_id] = []
+            self.active_connections[upload_id] = set()
         self.active_connections.clear()
         logger.info("All WebSocket connections cleaned up")
 